@@ -1,4 +1,3 @@
-import pandas as pd
 import os
 import sys
 import torch
@@ -9,6 +8,8 @@ import warnings
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tqdm import tqdm
+from dataset_io import dataset_exists, read_dataset
+from plot_jobs import PlotJob, render_plots
 
 # Libraries
 import gensim
@@ -34,6 +35,7 @@ INPUT_FILE = "preprocessing_berita_revisi.csv"
 OUTPUT_DIR = "bigram_Result_Hybrid_Analysis"
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 SEED = 42
+FORCE_REPLOT = False  # True = gambar ulang grafik walau datanya tidak berubah
 
 # PARAMETER HYBRID
 NUM_TOPICS_LDA = 25  # Menggunakan Hasil Tuning Terbaik
@@ -182,20 +184,25 @@ def save_report_and_viz(topic_model, metrics, output_dir):
             f.write("Analisis PESTLE:\n[ ] Political\n[ ] Economic\n[ ] Social\n[ ] Technological\n[ ] Legal\n[ ] Environmental\n")
             f.write("-" * 40 + "\n")
 
-    # 2. Visualisasi BERTopic
+    # 2. Visualisasi BERTopic (bar chart digambar lewat render_plots)
     print("[-] Membuat Visualisasi BERTopic...")
     top_15 = freq.head(15).sort_values('Count', ascending=True)
-    plt.figure(figsize=(12, 8))
-    plt.barh(top_15['Name'].apply(lambda x: " ".join(x.split("_")[1:5])), top_15['Count'], color='#9b59b6')
-    plt.title(f'Topik Dominan - Hybrid Model', fontsize=15)
-    plt.xlabel('Jumlah Berita')
-    plt.tight_layout()
-    plt.savefig(os.path.join(img_dir, "1_barchart_hybrid.png"), dpi=300)
-    plt.close()
+    bar_data = {
+        'labels': top_15['Name'].apply(lambda x: " ".join(x.split("_")[1:5])).tolist(),
+        'counts': [int(c) for c in top_15['Count']]
+    }
     
     try:
         topic_model.visualize_topics().write_html(os.path.join(output_dir, "interactive_hybrid_bertopic.html"))
     except: pass
+    return [PlotJob(os.path.join(img_dir, "1_barchart_hybrid.png"), _render_barchart_hybrid, bar_data)]
+
+def _render_barchart_hybrid(data):
+    plt.figure(figsize=(12, 8))
+    plt.barh(data['labels'], data['counts'], color='#9b59b6')
+    plt.title(f'Topik Dominan - Hybrid Model', fontsize=15)
+    plt.xlabel('Jumlah Berita')
+    plt.tight_layout()
 
 def save_lda_visualization(lda_model, corpus, id2word, output_dir):
     """
@@ -226,8 +233,8 @@ def main():
         print(f"    GPU Name: {torch.cuda.get_device_name(0)}")
     
     # 1. Load Data
-    if not os.path.exists(INPUT_FILE): return
-    df = pd.read_csv(INPUT_FILE)
+    if not dataset_exists(INPUT_FILE): return
+    df = read_dataset(INPUT_FILE, columns=['processed_text'])
     
     # 2. FILTERING & ALIGNMENT
     print("[-] Melakukan Alignment Data (Filter Dokumen Pendek)...")
@@ -271,7 +278,8 @@ def main():
     print(f"    > HASIL HYBRID: Topik={len(topic_model.get_topic_info())-1} | NPMI={npmi:.4f} | Cv={cv:.4f}")
     
     # 6. Simpan Hasil
-    save_report_and_viz(topic_model, (npmi, cv, diversity), OUTPUT_DIR)
+    plot_jobs = save_report_and_viz(topic_model, (npmi, cv, diversity), OUTPUT_DIR)
+    render_plots(plot_jobs, force=FORCE_REPLOT)
     
     # 7. Simpan Visualisasi pyLDAvis (SESUAI REQUEST GAMBAR)
     save_lda_visualization(lda_model, corpus, id2word, OUTPUT_DIR)
@@ -6,7 +6,12 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 import ast
+import functools
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
+from dataset_io import dataset_exists, dataset_columns, dataset_file, read_dataset
+from plot_jobs import PlotJob, render_plots
 
 # Library NLTK untuk Stopwords
 import nltk
@@ -19,9 +24,10 @@ except LookupError:
 # Library LDA Gensim
 import gensim
 import gensim.corpora as corpora
-from gensim.models import CoherenceModel, LdaMulticore
+from gensim.models import CoherenceModel, LdaModel, LdaMulticore
 import pyLDAvis
 import pyLDAvis.gensim_models as gensimvis
+from lda_cache import LdaArtifacts, artifacts_fingerprint
 
 # Setup Logging
 import logging
@@ -35,9 +41,38 @@ SEED = 42
 # [PILIHAN BIGRAM]
 USE_BIGRAMS = False # Set True untuk mengaktifkan Frasa, False untuk kata tunggal
 
+# Parameter frasa (bigram) & filter kata ekstrem Dictionary
+BIGRAM_PARAMS = {'min_count': 5, 'threshold': 50}
+FILTER_EXTREMES = {'no_below': 5, 'no_above': 0.5}
+
+# Cache artefak persiapan (token, phraser, Dictionary, corpus BoW ter-mmap) per fingerprint input + setting
+USE_LDA_CACHE = True
+LDA_CACHE_DIR = "lda_cache"
+PREP_VERSION = 1  # Naikkan kalau logika prepare_data/create_dictionary_corpus diubah (membatalkan cache)
+
 # Range jumlah topik yang akan dites (Hyperparameter Tuning)
 TOPIC_RANGE = [5, 10, 15, 20, 25, 30]
 
+# Render grafik paralel; grafik yang datanya tidak berubah sejak run sebelumnya dilewati
+PLOT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+FORCE_REPLOT = False
+
+# Sweep K paralel: None = otomatis (sebanyak K yang muat di core mesin, LDA_WORKERS + 1 core per model)
+SWEEP_PARALLEL = None
+# Worker LdaMulticore per model, tetap sama di semua mesin supaya skor coherence sweep bisa dibandingkan
+LDA_WORKERS = 3
+
+# Early stopping: training per K berhenti saat perplexity (sampel EARLY_STOP_SAMPLE dokumen)
+# tidak membaik > EARLY_STOP_TOL selama EARLY_STOP_PATIENCE pass; 'passes' jadi batas maksimum
+EARLY_STOPPING = True
+EARLY_STOP_TOL = 0.001
+EARLY_STOP_PATIENCE = 2
+EARLY_STOP_MIN_PASSES = 5
+EARLY_STOP_SAMPLE = 2000
+
+# Warm start: K lebih besar diinisialisasi dari K terkecil dengan memecah topiknya
+WARM_START = False
+
 # Konfigurasi Training LDA
 LDA_PARAMS = {
     'chunksize': 2000,
@@ -47,19 +82,8 @@ LDA_PARAMS = {
     'eta': None
 }
 
-def prepare_data(filepath):
-    """
-    Memuat data dan melakukan Heavy Cleaning (Stopword Removal) khusus untuk LDA.
-    """
-    print(f"[-] Memuat data: {filepath}")
-    if not os.path.exists(filepath):
-        print(f"[!] File {filepath} tidak ditemukan.")
-        return None
-
-    df = pd.read_csv(filepath)
-    data_tokens = []
-    
-    # 1. Setup Stopwords Bahasa Indonesia
+def build_stopwords():
+    """Stopwords NLTK Bahasa Indonesia + noise khas berita/jurnalistik"""
     print("[-] Menginisialisasi Stopwords (NLTK + Custom)...")
     stop_words = set(stopwords.words('indonesian'))
     
@@ -76,17 +100,34 @@ def prepare_data(filepath):
         "sangat", "lebih", "paling", "kurang", "cukup", "sendiri", "lain", "tulis"
     }
     stop_words.update(custom_noise)
+    return stop_words
 
-    print("[-] Memproses token & Menghapus Stopwords...")
-    
-    # Deteksi kolom target
-    if 'processed_text' in df.columns:
+def prepare_data(filepath, stop_words=None):
+    """
+    Memuat data dan melakukan Heavy Cleaning (Stopword Removal) khusus untuk LDA.
+    """
+    print(f"[-] Memuat data: {filepath}")
+    if not dataset_exists(filepath):
+        print(f"[!] File {filepath} tidak ditemukan.")
+        return None
+
+    # Deteksi kolom target (hanya kolom ini yang dibaca dari dataset)
+    columns = dataset_columns(filepath)
+    if 'processed_text' in columns:
         col_target = 'processed_text'
-    elif 'clean_tokens' in df.columns:
+    elif 'clean_tokens' in columns:
         col_target = 'clean_tokens'
     else:
-        col_target = df.columns[0] # Fallback
+        col_target = columns[0] # Fallback
+    df = read_dataset(filepath, columns=[col_target])
+    data_tokens = []
+    
+    # 1. Setup Stopwords Bahasa Indonesia
+    if stop_words is None:
+        stop_words = build_stopwords()
 
+    print("[-] Memproses token & Menghapus Stopwords...")
+    
     for item in df[col_target]:
         try:
             # Parsing jika formatnya list string "['a', 'b']"
@@ -117,35 +158,75 @@ def create_dictionary_corpus(data_tokens):
     # --- LOGIKA BIGRAM TOGGLE ---
     if USE_BIGRAMS:
         print("[-] Mode Bigram: AKTIF. Membangun Frasa...")
-        bigram = gensim.models.Phrases(data_tokens, min_count=5, threshold=50) 
+        bigram = gensim.models.Phrases(data_tokens, **BIGRAM_PARAMS) 
         bigram_mod = gensim.models.phrases.Phraser(bigram)
         # Update data_tokens dengan Bigram
         data_tokens = [bigram_mod[doc] for doc in data_tokens]
     else:
         print("[-] Mode Bigram: NON-AKTIF. Menggunakan Unigram...")
+        bigram_mod = None
     # ----------------------------------------
 
     # 1. Buat Dictionary
     id2word = corpora.Dictionary(data_tokens)
     
     # 2. Filter kata ekstrem
-    id2word.filter_extremes(no_below=5, no_above=0.5)
+    id2word.filter_extremes(**FILTER_EXTREMES)
     
     # 3. Buat Corpus
     corpus = [id2word.doc2bow(text) for text in data_tokens]
     
-    return id2word, corpus, data_tokens
+    return id2word, corpus, data_tokens, bigram_mod
 
-def calculate_metrics(lda_model, corpus, id2word, data_tokens):
+def load_or_build_corpus(filepath):
+    """
+    prepare_data + create_dictionary_corpus dengan cache di LDA_CACHE_DIR.
+    Return (data_tokens, id2word, corpus, artifacts), atau None kalau input tidak ada / kosong.
+    artifacts (LdaArtifacts, None kalau cache dimatikan) dipakai worker sweep untuk membaca corpus dari disk.
+    """
+    if not dataset_exists(filepath):
+        print(f"[!] File {filepath} tidak ditemukan.")
+        return None
+    if not USE_LDA_CACHE:
+        data_tokens = prepare_data(filepath)
+        if not data_tokens: return None
+        id2word, corpus, data_tokens, _ = create_dictionary_corpus(data_tokens)
+        return data_tokens, id2word, corpus, None
+
+    stop_words = build_stopwords()
+    settings = {
+        'version': PREP_VERSION,
+        'stopwords': sorted(stop_words),
+        'use_bigrams': USE_BIGRAMS,
+        'bigram_params': BIGRAM_PARAMS,
+        'filter_extremes': FILTER_EXTREMES
+    }
+    artifacts = LdaArtifacts(LDA_CACHE_DIR, artifacts_fingerprint(dataset_file(filepath), settings))
+    if artifacts.exists():
+        print(f"[-] Memuat artefak LDA dari cache: {artifacts.path}")
+        data_tokens, id2word, corpus, _ = artifacts.load()
+        print(f"    > {len(data_tokens)} dokumen, vocabulary {len(id2word)} kata (persiapan data dilewati)")
+        return data_tokens, id2word, corpus, artifacts
+
+    data_tokens = prepare_data(filepath, stop_words)
+    if not data_tokens: return None
+    id2word, corpus, data_tokens, bigram_mod = create_dictionary_corpus(data_tokens)
+    print(f"[-] Menyimpan artefak LDA ke cache: {artifacts.path}")
+    artifacts.save(data_tokens, id2word, corpus, bigram_mod)
+    return data_tokens, id2word, corpus, artifacts
+
+def calculate_metrics(lda_model, corpus, id2word, data_tokens, processes=-1):
     """
     Menghitung 3 Metrik Utama: NPMI, Cv, dan Diversity
     """
     # 1. Coherence NPMI (Evaluasi Semantik Ketat)
-    cm_npmi = CoherenceModel(model=lda_model, texts=data_tokens, dictionary=id2word, coherence='c_npmi')
+    cm_npmi = CoherenceModel(model=lda_model, texts=data_tokens, dictionary=id2word, coherence='c_npmi',
+                             processes=processes)
     npmi = cm_npmi.get_coherence()
     
     # 2. Coherence Cv (Evaluasi Standar)
-    cm_cv = CoherenceModel(model=lda_model, texts=data_tokens, dictionary=id2word, coherence='c_v')
+    cm_cv = CoherenceModel(model=lda_model, texts=data_tokens, dictionary=id2word, coherence='c_v',
+                           processes=processes)
     cv = cm_cv.get_coherence()
     
     # 3. Topic Diversity (Uniqueness)
@@ -162,103 +243,217 @@ def calculate_metrics(lda_model, corpus, id2word, data_tokens):
     
     return npmi, cv, diversity
 
-def train_and_evaluate(data_tokens, id2word, corpus):
+def plan_sweep(n_models, cpu_count=None):
+    """
+    Return (jumlah model K yang dilatih bersamaan, core per model untuk evaluasi coherence).
+    Default: sebanyak K yang muat kalau tiap model memakai LDA_WORKERS + 1 core.
+    Trainer tiap model tidak ikut berubah (lihat train_topic_model), hanya jumlah model bersamaan.
+    """
+    cpu = cpu_count or os.cpu_count() or 1
+    parallel = SWEEP_PARALLEL or cpu // (LDA_WORKERS + 1)
+    parallel = max(1, min(parallel, n_models))
+    return parallel, max(1, cpu // parallel)
+
+def _extra_pass_mstep(model, rho, other, extra_pass=False):
+    # Pass ke-2 dst. diperlakukan sebagai "extra pass" gensim (num_updates tidak bertambah)
+    return LdaModel.do_mstep(model, rho, other, extra_pass=True)
+
+def split_topics(sstats, num_topics, seed=SEED):
+    """
+    Warm start K besar dari solusi K kecil: tiap topik induk dipecah jadi beberapa topik anak.
+    Anak = statistik induk dibagi rata ke jumlah anaknya, dikali noise gamma kecil untuk memecah simetri.
+    """
+    rng = np.random.RandomState(seed)
+    parents = np.arange(num_topics) % len(sstats)
+    children = np.bincount(parents, minlength=len(sstats))
+    init = sstats[parents] / children[parents][:, None]
+    return init * rng.gamma(100., 1. / 100., init.shape)
+
+def eval_sample(corpus, size):
+    """Sampel dokumen tersebar merata (tiap n dokumen) untuk cek perplexity antar pass"""
+    step = max(1, len(corpus) // size)
+    return [doc for i, doc in enumerate(corpus) if i % step == 0][:size]
+
+def train_passes(lda_model, corpus, passes, check_corpus=None):
+    """
+    Latih lda_model pass demi pass dengan jadwal learning rate yang sama dengan update(passes=N).
+    Kalau check_corpus diberikan, berhenti lebih awal saat perplexity-nya tidak membaik lebih dari
+    EARLY_STOP_TOL (relatif) selama EARLY_STOP_PATIENCE pass berturut-turut. Return jumlah pass.
+    """
+    base_offset = lda_model.offset
+    n_docs = len(corpus)
+    lda_model.passes = 1
+    best, stale = None, 0
+    try:
+        for pass_ in range(passes):
+            lda_model.offset = base_offset + pass_
+            if pass_ == 1:
+                lda_model.do_mstep = functools.partial(_extra_pass_mstep, lda_model)
+            if pass_ > 0:
+                # update() menambah numdocs setiap dipanggil; pass lanjutan tidak boleh menambah dokumen
+                lda_model.state.numdocs -= n_docs
+            lda_model.update(corpus)
+            if check_corpus is None or pass_ + 1 >= passes:
+                continue
+
+            # log_perplexity memakai random_state model; disimpan supaya training tidak ikut berubah
+            rng_state = lda_model.random_state.get_state()
+            perplexity = np.exp2(-lda_model.log_perplexity(check_corpus))
+            lda_model.random_state.set_state(rng_state)
+            if best is not None and (best - perplexity) / best < EARLY_STOP_TOL:
+                stale += 1
+            else:
+                stale = 0
+            best = perplexity if best is None else min(best, perplexity)
+            if stale >= EARLY_STOP_PATIENCE and pass_ + 1 >= EARLY_STOP_MIN_PASSES:
+                return pass_ + 1
+        return passes
+    finally:
+        lda_model.offset = base_offset
+        lda_model.passes = passes
+        lda_model.__dict__.pop('do_mstep', None)
+
+def train_topic_model(k, corpus, id2word, init_sstats=None):
+    """
+    Latih 1 model LDA dengan LdaMulticore(workers=LDA_WORKERS), sama seperti baseline di mesin mana pun.
+    init_sstats: statistik topik-kata model K lebih kecil untuk warm start (lihat split_topics).
+    Return (model, jumlah pass yang dijalankan).
+    """
+    params = dict(id2word=id2word, num_topics=k, random_state=SEED,
+                  chunksize=LDA_PARAMS['chunksize'], passes=LDA_PARAMS['passes'],
+                  per_word_topics=LDA_PARAMS['per_word_topics'])
+    lda_model = LdaMulticore(workers=LDA_WORKERS, **params)
+    if init_sstats is not None:
+        lda_model.state.sstats = split_topics(init_sstats, k).astype(lda_model.dtype)
+        lda_model.sync_state()
+
+    check_corpus = eval_sample(corpus, EARLY_STOP_SAMPLE) if EARLY_STOPPING else None
+    passes = train_passes(lda_model, corpus, LDA_PARAMS['passes'], check_corpus)
+    return lda_model, passes
+
+def evaluate_topic_count(k, data_tokens, id2word, corpus, cores, init_sstats=None):
+    lda_model, passes = train_topic_model(k, corpus, id2word, init_sstats)
+    npmi, cv, div = calculate_metrics(lda_model, corpus, id2word, data_tokens, processes=cores)
+    return {'Num_Topics': k, 'NPMI': npmi, 'Cv': cv, 'Diversity': div, 'Passes': passes}, lda_model
+
+# --- SWEEP PARALEL (1 proses per K) ---
+_sweep_data = None
+
+def _init_sweep_worker(artifacts):
+    """Initializer worker: token & Dictionary dimuat sekali per proses, corpus di-mmap dari disk"""
+    global _sweep_data
+    data_tokens, id2word, corpus, _ = artifacts.load()
+    _sweep_data = (data_tokens, id2word, corpus)
+
+def _sweep_task(k, cores, init_sstats=None):
+    data_tokens, id2word, corpus = _sweep_data
+    return evaluate_topic_count(k, data_tokens, id2word, corpus, cores, init_sstats)
+
+def train_and_evaluate(data_tokens, id2word, corpus, artifacts=None):
+    """
+    Latih & evaluasi 1 model per K di TOPIC_RANGE.
+    Beberapa K dilatih bersamaan di process pool (lihat plan_sweep); worker me-mmap corpus
+    hasil serialisasi (artifacts, LdaArtifacts) secara read-only (halaman file dibagi lewat page cache OS),
+    token & Dictionary dimuat sekali per worker. Tidak ada salinan pickle per task.
+    """
     results = []
     models_store = {}
+    topic_range = sorted(TOPIC_RANGE)
     
     print(f"\n{'='*40}")
     print(f"  MULAI TUNING JUMLAH TOPIK (K)")
     print(f"{'='*40}")
+    if EARLY_STOPPING:
+        print(f"[-] Early stopping aktif (maks {LDA_PARAMS['passes']} pass, toleransi perplexity {EARLY_STOP_TOL})")
+
+    # Warm start: K terkecil dilatih dulu (semua core), K lain diinisialisasi dari topik-topiknya
+    init_sstats = None
+    if WARM_START and len(topic_range) > 1:
+        base_k = topic_range.pop(0)
+        print(f"[-] Warm start: melatih K={base_k} sebagai model dasar...")
+        row, models_store[base_k] = evaluate_topic_count(base_k, data_tokens, id2word, corpus, plan_sweep(1)[1])
+        results.append(row)
+        init_sstats = models_store[base_k].state.sstats
+
+    parallel, cores = plan_sweep(len(topic_range))
+    print(f"[-] {parallel} model dilatih bersamaan (LdaMulticore {LDA_WORKERS} worker per model), {cores} core per model untuk evaluasi")
     
-    for k in tqdm(TOPIC_RANGE, desc="Training LDA Models"):
-        # Train LDA
-        lda_model = LdaMulticore(corpus=corpus,
-                                 id2word=id2word,
-                                 num_topics=k, 
-                                 random_state=SEED,
-                                 chunksize=LDA_PARAMS['chunksize'],
-                                 passes=LDA_PARAMS['passes'],
-                                 per_word_topics=LDA_PARAMS['per_word_topics'],
-                                 workers=3)
-        
-        # Hitung Metrik
-        npmi, cv, div = calculate_metrics(lda_model, corpus, id2word, data_tokens)
-        
-        results.append({
-            'Num_Topics': k,
-            'NPMI': npmi,
-            'Cv': cv,
-            'Diversity': div
-        })
-        models_store[k] = lda_model
+    if parallel <= 1:
+        for k in tqdm(topic_range, desc="Training LDA Models"):
+            row, models_store[k] = evaluate_topic_count(k, data_tokens, id2word, corpus, cores, init_sstats)
+            results.append(row)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if artifacts is None:
+                # Cache dimatikan: serialisasi sementara supaya worker tetap bisa membaca dari disk
+                artifacts = LdaArtifacts(tmp_dir, "sweep")
+                artifacts.save(data_tokens, id2word, corpus)
+            with ProcessPoolExecutor(max_workers=parallel, initializer=_init_sweep_worker,
+                                     initargs=(artifacts,)) as executor:
+                # K terbesar (paling lama) dijadwalkan lebih dulu
+                futures = [executor.submit(_sweep_task, k, cores, init_sstats) for k in reversed(topic_range)]
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Training LDA Models"):
+                    row, lda_model = future.result()
+                    results.append(row)
+                    models_store[row['Num_Topics']] = lda_model
+    results.sort(key=lambda row: row['Num_Topics'])
         
     return pd.DataFrame(results), models_store
 
+# Spesifikasi grafik evaluasi per metrik: (file, kolom, marker, warna, judul, label sumbu Y)
+TUNING_PLOTS = [
+    ("grafik_evaluasi_1_NPMI.png", 'NPMI', 'o', '#27ae60',
+     "Evaluasi Metrik 1: Coherence NPMI (Semantik)", "NPMI Score (Higher is Better)"),
+    ("grafik_evaluasi_2_Cv.png", 'Cv', 's', '#2980b9',
+     "Evaluasi Metrik 2: Coherence Cv (Standar)", "Cv Score (Higher is Better)"),
+    ("grafik_evaluasi_3_Diversity.png", 'Diversity', '^', '#e74c3c',
+     "Evaluasi Metrik 3: Topic Diversity (Keunikan)", "Diversity Score (0-1)"),
+]
+
 def plot_tuning_result(df_results, output_dir):
     """
-    [MODIFIKASI] Membuat 4 Grafik: NPMI, Cv, Diversity, dan Combined.
+    [MODIFIKASI] Menyiapkan 4 Grafik: NPMI, Cv, Diversity, dan Combined.
+    Return daftar PlotJob (digambar lewat render_plots).
     """
-    print("[-] Membuat Grafik Evaluasi Tuning (Individu & Gabungan)...")
-    
-    # Gunakan style seaborn
-    sns.set_style("whitegrid")
-    
-    # 1. Grafik Coherence NPMI
-    plt.figure(figsize=(10, 6))
-    plt.plot(df_results['Num_Topics'], df_results['NPMI'], marker='o', color='#27ae60', linewidth=2.5)
-    plt.title("Evaluasi Metrik 1: Coherence NPMI (Semantik)", fontsize=14, pad=15)
-    plt.xlabel("Jumlah Topik (K)", fontsize=12)
-    plt.ylabel("NPMI Score (Higher is Better)", fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "grafik_evaluasi_1_NPMI.png"), dpi=300)
-    plt.close()
+    print("[-] Menyiapkan Grafik Evaluasi Tuning (Individu & Gabungan)...")
+    scores = df_results[['Num_Topics', 'NPMI', 'Cv', 'Diversity']].to_dict('list')
+    jobs = [PlotJob(os.path.join(output_dir, spec[0]), _render_tuning_metric, {'scores': scores, 'spec': spec})
+            for spec in TUNING_PLOTS]
+    jobs.append(PlotJob(os.path.join(output_dir, "grafik_evaluasi_4_GABUNGAN.png"), _render_tuning_combined, scores))
+    return jobs
 
-    # 2. Grafik Coherence Cv
-    plt.figure(figsize=(10, 6))
-    plt.plot(df_results['Num_Topics'], df_results['Cv'], marker='s', color='#2980b9', linewidth=2.5)
-    plt.title("Evaluasi Metrik 2: Coherence Cv (Standar)", fontsize=14, pad=15)
-    plt.xlabel("Jumlah Topik (K)", fontsize=12)
-    plt.ylabel("Cv Score (Higher is Better)", fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "grafik_evaluasi_2_Cv.png"), dpi=300)
-    plt.close()
-
-    # 3. Grafik Topic Diversity
+def _render_tuning_metric(data):
+    scores = data['scores']
+    _, metric, marker, color, title, ylabel = data['spec']
+    sns.set_style("whitegrid")
     plt.figure(figsize=(10, 6))
-    plt.plot(df_results['Num_Topics'], df_results['Diversity'], marker='^', color='#e74c3c', linewidth=2.5)
-    plt.title("Evaluasi Metrik 3: Topic Diversity (Keunikan)", fontsize=14, pad=15)
+    plt.plot(scores['Num_Topics'], scores[metric], marker=marker, color=color, linewidth=2.5)
+    plt.title(title, fontsize=14, pad=15)
     plt.xlabel("Jumlah Topik (K)", fontsize=12)
-    plt.ylabel("Diversity Score (0-1)", fontsize=12)
+    plt.ylabel(ylabel, fontsize=12)
     plt.grid(True, linestyle='--', alpha=0.7)
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "grafik_evaluasi_3_Diversity.png"), dpi=300)
-    plt.close()
 
-    # 4. Grafik Gabungan (Combined)
+def _render_tuning_combined(scores):
+    sns.set_style("whitegrid")
     plt.figure(figsize=(12, 7))
-    plt.plot(df_results['Num_Topics'], df_results['NPMI'], marker='o', label='NPMI (Semantik)', color='#27ae60', linewidth=2)
-    plt.plot(df_results['Num_Topics'], df_results['Cv'], marker='s', label='Cv (Standar)', color='#2980b9', linewidth=2)
-    plt.plot(df_results['Num_Topics'], df_results['Diversity'], marker='^', label='Diversity (Keunikan)', color='#e74c3c', linewidth=2)
-    
+    plt.plot(scores['Num_Topics'], scores['NPMI'], marker='o', label='NPMI (Semantik)', color='#27ae60', linewidth=2)
+    plt.plot(scores['Num_Topics'], scores['Cv'], marker='s', label='Cv (Standar)', color='#2980b9', linewidth=2)
+    plt.plot(scores['Num_Topics'], scores['Diversity'], marker='^', label='Diversity (Keunikan)', color='#e74c3c', linewidth=2)
+
     plt.title("Komparasi Gabungan Semua Metrik Evaluasi LDA", fontsize=16, pad=20)
     plt.xlabel("Jumlah Topik (K)", fontsize=12)
     plt.ylabel("Normalized Score Value", fontsize=12)
     plt.legend(loc='best', fontsize=11, frameon=True)
     plt.grid(True, linestyle='--', alpha=0.5)
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "grafik_evaluasi_4_GABUNGAN.png"), dpi=300)
-    plt.close()
 
-def generate_visualizations(lda_model, corpus, id2word, best_k, output_dir):
-    img_dir = os.path.join(output_dir, "plots_visualization")
-    os.makedirs(img_dir, exist_ok=True)
-    
-    # A. Bar Chart Bobot Kata per Topik
-    # [PERBAIKAN] Menggunakan best_k agar menampilkan SEMUA topik yang terbentuk
-    topics = lda_model.show_topics(num_topics=best_k, num_words=10, formatted=False)
-    
+def _topic_words(topics):
+    """show_topics(formatted=False) -> list (topic_id, [(kata, bobot float)]) yang ringan & bisa di-pickle"""
+    return [(int(topic_id), [(w, float(score)) for w, score in word_list]) for topic_id, word_list in topics]
+
+def _render_topic_barchart(topics):
+    sns.set_style("whitegrid")
     cols = 2
     rows = int(np.ceil(len(topics) / cols))
     fig, axes = plt.subplots(rows, cols, figsize=(15, 5 * rows), sharex=False)
@@ -267,42 +462,50 @@ def generate_visualizations(lda_model, corpus, id2word, best_k, output_dir):
     for i, (topic_id, word_list) in enumerate(topics):
         words = [w[0] for w in word_list]
         scores = [w[1] for w in word_list]
-        
+
         axes[i].barh(words, scores, color='#3498db')
         axes[i].set_title(f'Topik #{topic_id}', fontsize=12)
         axes[i].invert_yaxis()
-        
+
     for j in range(i+1, len(axes)): axes[j].axis('off')
-        
     plt.tight_layout()
-    plt.savefig(os.path.join(img_dir, "1_barchart_topic_keywords.png"), dpi=300)
-    plt.close()
 
-    # B. WordClouds
-    print("    [-] Membuat WordCloud LDA...")
-    # [PERBAIKAN] Menggunakan best_k agar menampilkan SEMUA topik
-    topics_wc = lda_model.show_topics(num_topics=best_k, num_words=30, formatted=False)
-    
+def _render_topic_wordclouds(topics_wc):
     # [PERBAIKAN] Hitung baris dinamis berdasarkan jumlah topik
     cols = 3
     rows = int(np.ceil(len(topics_wc) / cols))
-    
+
     # Sesuaikan tinggi figure dengan jumlah baris
     fig, axes = plt.subplots(rows, cols, figsize=(18, 5 * rows))
     axes = axes.flatten()
-    
+
     for i, (topic_id, word_list) in enumerate(topics_wc):
         word_freq = {w[0]: w[1] for w in word_list}
         wc = WordCloud(width=600, height=400, background_color='white', colormap='magma').generate_from_frequencies(word_freq)
         axes[i].imshow(wc, interpolation='bilinear')
         axes[i].axis("off")
         axes[i].set_title(f"LDA Topik {topic_id}", fontsize=14)
-        
+
     # Matikan axis untuk plot kosong sisa grid
     for j in range(i+1, len(axes)): axes[j].axis('off')
     plt.tight_layout()
-    plt.savefig(os.path.join(img_dir, "2_wordclouds_lda.png"), dpi=300)
-    plt.close()
+
+def generate_visualizations(lda_model, corpus, id2word, best_k, output_dir):
+    """Simpan pyLDAvis (HTML) langsung; return daftar PlotJob untuk bar chart & WordCloud."""
+    img_dir = os.path.join(output_dir, "plots_visualization")
+    os.makedirs(img_dir, exist_ok=True)
+
+    # A. Bar Chart Bobot Kata per Topik
+    # [PERBAIKAN] Menggunakan best_k agar menampilkan SEMUA topik yang terbentuk
+    topics = _topic_words(lda_model.show_topics(num_topics=best_k, num_words=10, formatted=False))
+
+    # B. WordClouds
+    # [PERBAIKAN] Menggunakan best_k agar menampilkan SEMUA topik
+    topics_wc = _topic_words(lda_model.show_topics(num_topics=best_k, num_words=30, formatted=False))
+    jobs = [
+        PlotJob(os.path.join(img_dir, "1_barchart_topic_keywords.png"), _render_topic_barchart, topics),
+        PlotJob(os.path.join(img_dir, "2_wordclouds_lda.png"), _render_topic_wordclouds, topics_wc)
+    ]
 
     # C. Interactive pyLDAvis
     try:
@@ -311,6 +514,7 @@ def generate_visualizations(lda_model, corpus, id2word, best_k, output_dir):
         pyLDAvis.save_html(vis_data, os.path.join(img_dir, "lda_interactive_map.html"))
     except Exception as e:
         print(f"    [!] Gagal membuat pyLDAvis: {e}")
+    return jobs
 
 def save_detailed_report(best_model, best_row, df_results, output_dir):
     report_file = os.path.join(output_dir, "ANALISIS_PESTLE_MANUAL_LDA.txt")
@@ -356,15 +560,15 @@ def save_detailed_report(best_model, best_row, df_results, output_dir):
 def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    # 1. Load & Prepare
-    data_tokens = prepare_data(INPUT_FILE)
-    if not data_tokens: return
+    # 1. Load & Prepare (dari cache kalau input & setting tidak berubah)
+    prepared = load_or_build_corpus(INPUT_FILE)
+    if not prepared: return
     
-    # Tangkap data_tokens yang baru (yang sudah Bigram) dari return function
-    id2word, corpus, data_tokens = create_dictionary_corpus(data_tokens)
+    # data_tokens yang dipakai sudah versi Bigram (kalau aktif)
+    data_tokens, id2word, corpus, artifacts = prepared
     
     # 2. Tuning Loop
-    df_results, models_store = train_and_evaluate(data_tokens, id2word, corpus)
+    df_results, models_store = train_and_evaluate(data_tokens, id2word, corpus, artifacts)
     
     # 3. Pilih Model Terbaik (Prioritas NPMI)
     best_row = df_results.loc[df_results['NPMI'].idxmax()]
@@ -380,10 +584,11 @@ def main():
     df_results.to_csv(os.path.join(OUTPUT_DIR, "tabel_tuning_lda.csv"), index=False)
     
     # --- VISUALISASI EVALUASI (UPDATE) ---
-    plot_tuning_result(df_results, OUTPUT_DIR)
+    plot_jobs = plot_tuning_result(df_results, OUTPUT_DIR)
     
     # Visualisasi & Laporan
-    generate_visualizations(best_model, corpus, id2word, best_k, OUTPUT_DIR)
+    plot_jobs += generate_visualizations(best_model, corpus, id2word, best_k, OUTPUT_DIR)
+    render_plots(plot_jobs, workers=PLOT_WORKERS, force=FORCE_REPLOT)
     save_detailed_report(best_model, best_row, df_results, OUTPUT_DIR)
             
     print(f"\n[+] Selesai. Laporan detail ada di: {os.path.join(OUTPUT_DIR, 'ANALISIS_PESTLE_MANUAL_LDA.txt')}")
@@ -10,6 +10,8 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from wordcloud import WordCloud
 from tqdm import tqdm
+from dataset_io import dataset_exists, read_dataset
+from plot_jobs import PlotJob, render_plots
 
 import bertopic
 from bertopic import BERTopic
@@ -31,6 +33,10 @@ OUTPUT_DIR = "Result_BERTopic_Analysis_revisi"
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
 SEED = 42
 
+# Render grafik paralel (setelah semua model selesai); grafik yang datanya tidak berubah dilewati
+PLOT_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+FORCE_REPLOT = False
+
 # DAFTAR STOPWORDS (Untuk membuang topik sampah "yang", "dan", dll)
 STOPWORDS_ID = [
     "yang", "dan", "di", "ke", "dari", "ini", "itu", "untuk", "pada", "dengan", 
@@ -130,45 +136,58 @@ def calculate_metrics(topic_model, docs_tokens):
     return npmi, cv, diversity
 
 def generate_visualizations(topic_model, output_dir, model_label):
+    """Simpan peta interaktif (HTML) langsung; return daftar PlotJob untuk bar chart & WordCloud."""
     freq = topic_model.get_topic_info()
     freq = freq[freq['Topic'] != -1]
     
-    if freq.empty: return
+    if freq.empty: return []
 
     # A. Bar Chart Top Topics
     top_15 = freq.head(15).sort_values('Count', ascending=True)
+    bar_data = {
+        'labels': top_15['Name'].apply(lambda x: " ".join(x.split("_")[1:5])).tolist(),
+        'counts': [int(c) for c in top_15['Count']],
+        'model_label': model_label
+    }
+
+    # B. WordClouds (6 topik terbesar)
+    wc_data = []
+    for index, row in freq.head(6).iterrows():
+        topic_id = row['Topic']
+        words = topic_model.get_topic(topic_id)
+        if not words: continue
+        wc_data.append((int(topic_id), int(row['Count']), {w[0]: float(w[1]) for w in words}))
+
+    jobs = [
+        PlotJob(os.path.join(output_dir, "1_barchart_top_topics.png"), _render_top_topics, bar_data),
+        PlotJob(os.path.join(output_dir, "2_wordclouds.png"), _render_wordclouds, wc_data)
+    ]
+
+    # C. Interactive Maps
+    try:
+        topic_model.visualize_topics().write_html(os.path.join(output_dir, "interactive_map.html"))
+        topic_model.visualize_hierarchy().write_html(os.path.join(output_dir, "interactive_hierarchy.html"))
+    except: pass
+    return jobs
+
+def _render_top_topics(data):
     plt.figure(figsize=(12, 8))
-    plt.barh(top_15['Name'].apply(lambda x: " ".join(x.split("_")[1:5])), top_15['Count'], color='#3498db')
-    plt.title(f'Topik Dominan - {model_label}', fontsize=15)
+    plt.barh(data['labels'], data['counts'], color='#3498db')
+    plt.title(f"Topik Dominan - {data['model_label']}", fontsize=15)
     plt.xlabel('Jumlah Berita')
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "1_barchart_top_topics.png"), dpi=300)
-    plt.close()
 
-    # B. WordClouds
-    print(f"    [-] Membuat WordCloud ({model_label})...")
+def _render_wordclouds(wc_data):
     fig, axes = plt.subplots(2, 3, figsize=(20, 10))
     axes = axes.flatten()
-    for i, (index, row) in enumerate(freq.head(6).iterrows()):
-        topic_id = row['Topic']
-        words = topic_model.get_topic(topic_id)
-        if not words: continue
-        word_freq = {w[0]: w[1] for w in words}
+    for i, (topic_id, count, word_freq) in enumerate(wc_data):
         wc = WordCloud(width=600, height=400, background_color='white', colormap='Dark2').generate_from_frequencies(word_freq)
         axes[i].imshow(wc, interpolation='bilinear')
         axes[i].axis("off")
-        axes[i].set_title(f"Topik {topic_id}\n(n={row['Count']})", fontsize=14)
-    
-    for j in range(i+1, 6): axes[j].axis('off')
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "2_wordclouds.png"), dpi=300)
-    plt.close()
+        axes[i].set_title(f"Topik {topic_id}\n(n={count})", fontsize=14)
 
-    # C. Interactive Maps
-    try:
-        topic_model.visualize_topics().write_html(os.path.join(output_dir, "interactive_map.html"))
-        topic_model.visualize_hierarchy().write_html(os.path.join(output_dir, "interactive_hierarchy.html"))
-    except: pass
+    for j in range(len(wc_data), 6): axes[j].axis('off')
+    plt.tight_layout()
 
 def save_model_specific_report(topic_model, model_name, metrics, output_dir):
     report_file = os.path.join(output_dir, f"LAPORAN_{model_name}.txt")
@@ -245,28 +264,31 @@ def save_comparison_report(df_results, output_dir):
         f.write("    semantik yang paling kuat dan mudah diinterpretasikan manusia dibandingkan model lainnya.\n")
 
 def plot_comparison(results_df, output_dir):
+    """Return PlotJob grafik perbandingan skor antar model embedding"""
+    scores = results_df[['Model', 'Coherence_Cv', 'Coherence_NPMI', 'Diversity']].to_dict('list')
+    return [PlotJob(os.path.join(output_dir, "GRAFIK_PERBANDINGAN_SKOR.png"), _render_comparison, scores)]
+
+def _render_comparison(scores):
     plt.figure(figsize=(12, 7))
     bar_width = 0.25
-    x = np.arange(len(results_df['Model']))
+    x = np.arange(len(scores['Model']))
     
-    plt.bar(x - bar_width, results_df['Coherence_Cv'], width=bar_width, label='Coherence (Cv)', color='#3498db', alpha=0.9)
-    plt.bar(x, results_df['Coherence_NPMI'], width=bar_width, label='Coherence (NPMI)', color='#2ecc71', alpha=0.9)
-    plt.bar(x + bar_width, results_df['Diversity'], width=bar_width, label='Topic Diversity', color='#e74c3c', alpha=0.9)
+    plt.bar(x - bar_width, scores['Coherence_Cv'], width=bar_width, label='Coherence (Cv)', color='#3498db', alpha=0.9)
+    plt.bar(x, scores['Coherence_NPMI'], width=bar_width, label='Coherence (NPMI)', color='#2ecc71', alpha=0.9)
+    plt.bar(x + bar_width, scores['Diversity'], width=bar_width, label='Topic Diversity', color='#e74c3c', alpha=0.9)
     
     plt.xlabel('Model Embedding', fontsize=12)
     plt.ylabel('Skor Evaluasi', fontsize=12)
     plt.title('Evaluasi Tuning: Perbandingan Performa Model Embedding', fontsize=14)
-    plt.xticks(x, results_df['Model'])
+    plt.xticks(x, scores['Model'])
     plt.legend()
     plt.grid(axis='y', linestyle='--', alpha=0.3)
     
     for i in x:
-        val_npmi = results_df['Coherence_NPMI'].iloc[i]
+        val_npmi = scores['Coherence_NPMI'][i]
         plt.text(i, max(0, val_npmi) + 0.01, f"{val_npmi:.3f}", ha='center', fontsize=9, fontweight='bold')
 
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "GRAFIK_PERBANDINGAN_SKOR.png"), dpi=300)
-    plt.close()
 
 def run_analysis():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -279,12 +301,12 @@ def run_analysis():
     if DEVICE == "cuda":
         print(f"    GPU: {torch.cuda.get_device_name(0)}")
 
-    if not os.path.exists(INPUT_FILE):
+    if not dataset_exists(INPUT_FILE):
         print(f"\n[!] ERROR: Input {INPUT_FILE} tidak ditemukan.")
         return
 
     print("[-] Memuat dataset...")
-    df = pd.read_csv(INPUT_FILE)
+    df = read_dataset(INPUT_FILE, columns=['processed_text'])
     docs = df['processed_text'].dropna().astype(str).tolist()
     
     # --- TOKENISASI ROBUST UNTUK GENSIM ---
@@ -298,6 +320,7 @@ def run_analysis():
     print("-" * 60)
 
     comparison_results = []
+    plot_jobs = []
 
     # LOOP EXPERIMENT
     for label, model_path in MODELS_TO_COMPARE.items():
@@ -356,7 +379,7 @@ def run_analysis():
         # 4. SIMPAN LAPORAN & VISUALISASI DI FOLDER MASING-MASING
         print(f"    [-] Menyimpan Laporan & Grafik ke folder: {label}/")
         save_model_specific_report(topic_model, label, metrics, model_output_dir)
-        generate_visualizations(topic_model, model_output_dir, label)
+        plot_jobs += generate_visualizations(topic_model, model_output_dir, label)
 
     # FINALISASI
     print(f"\n{'='*50}")
@@ -367,7 +390,8 @@ def run_analysis():
     
     # Simpan Tabel & Grafik Gabungan di Root Folder Output
     df_results.to_csv(os.path.join(OUTPUT_DIR, "tabel_komparasi_semua.csv"), index=False)
-    plot_comparison(df_results, OUTPUT_DIR)
+    plot_jobs += plot_comparison(df_results, OUTPUT_DIR)
+    render_plots(plot_jobs, workers=PLOT_WORKERS, force=FORCE_REPLOT)
     
     # --- TAMBAHAN: SIMPAN RANGKUMAN GABUNGAN .TXT ---
     save_comparison_report(df_results, OUTPUT_DIR)
@@ -0,0 +1,193 @@
+import re
+import string
+import sys
+import time
+import random
+import pandas as pd
+from datetime import datetime, timedelta
+from fix_tanggal import perbaiki_tanggal
+from tanggal_utils import normalize_to_iso, parse_dates
+from dataset_io import dataset_exists, dataset_columns, read_dataset
+
+# Benchmark & cek kesetaraan optimasi pipeline terhadap implementasi lama (per baris).
+# Jalankan: python benchmark_pipeline.py (exit code 1 kalau ada hasil yang tidak identik dengan acuan lama)
+
+REFERENCE_DATE = datetime(2025, 11, 30)
+N_ROWS = 200_000
+SEED = 42
+KONTEN_FILE = "pestle_konten.csv"  # Sumber sampel golden test cleaner, Parquet/CSV (fallback: teks sintetis)
+N_DOCS = 3_000
+
+def parse_indonesian_date_lama(date_series, current_time=REFERENCE_DATE):
+    """Implementasi lama parse_indonesian_date (apply per baris), disimpan sebagai acuan"""
+    month_map = {
+        'januari': '01', 'februari': '02', 'maret': '03', 'april': '04',
+        'mei': '05', 'juni': '06', 'juli': '07', 'agustus': '08',
+        'september': '09', 'oktober': '10', 'november': '11', 'desember': '12',
+        'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04', 'jun': '06',
+        'jul': '07', 'agu': '08', 'sep': '09', 'okt': '10', 'nov': '11', 'des': '12',
+        'agust': '08'
+    }
+
+    def clean_date_str(x):
+        x_str = str(x).lower().strip()
+        if any(k in x_str for k in ['baru saja', 'menit lalu', 'jam lalu', 'detik lalu', 'beberapa saat']):
+            return current_time.strftime("%d/%m/%Y")
+        if 'kemarin' in x_str:
+            return (current_time - timedelta(days=1)).strftime("%d/%m/%Y")
+        days_match = re.search(r'(\d+)\s+hari\s+lalu', x_str)
+        if days_match:
+            return (current_time - timedelta(days=int(days_match.group(1)))).strftime("%d/%m/%Y")
+        weeks_match = re.search(r'(\d+)\s+minggu\s+lalu', x_str)
+        if weeks_match:
+            return (current_time - timedelta(weeks=int(weeks_match.group(1)))).strftime("%d/%m/%Y")
+        months_match = re.search(r'(\d+)\s+bulan\s+lalu', x_str)
+        if months_match:
+            return (current_time - timedelta(days=int(months_match.group(1)) * 30)).strftime("%d/%m/%Y")
+        x_str = re.sub(r'(senin|selasa|rabu|kamis|jumat|sabtu|minggu)\s*,?', '', x_str).strip()
+        for ind, eng in month_map.items():
+            x_str = x_str.replace(f" {ind} ", f"/{eng}/")
+            x_str = x_str.replace(f" {ind}", f"/{eng}/")
+        x_str = re.sub(r'\s*\d{2}:\d{2}.*', '', x_str)
+        return x_str.replace(" ", "")
+
+    return pd.to_datetime(date_series.apply(clean_date_str), dayfirst=True, errors='coerce')
+
+def make_date_column(n, seed=SEED):
+    """Kolom Tanggal_Tayang sintetis dengan campuran format yang muncul di hasil scraping"""
+    rng = random.Random(seed)
+    hari = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+    bulan = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli',
+             'Agustus', 'September', 'Oktober', 'November', 'Desember']
+    bulan_pendek = ['Jan', 'Feb', 'Mar', 'Apr', 'Mei', 'Jun', 'Jul', 'Agu', 'Sep', 'Okt', 'Nov', 'Des']
+    values = []
+    for _ in range(n):
+        d, m, y = rng.randint(1, 28), rng.randint(0, 11), rng.choice([2024, 2025])
+        kind = rng.random()
+        if kind < 0.35:
+            values.append(f"{d} {bulan_pendek[m]} {y}")
+        elif kind < 0.55:
+            values.append(f"{rng.choice(hari)}, {d} {bulan[m]} {y} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d} WIB")
+        elif kind < 0.70:
+            values.append(f"{d} {bulan[m]} {y}")
+        elif kind < 0.80:
+            values.append(f"{rng.randint(1, 30)} {rng.choice(['hari', 'minggu', 'bulan'])} lalu")
+        elif kind < 0.85:
+            values.append(rng.choice(['Kemarin', 'Baru saja', '3 jam lalu', '15 menit lalu']))
+        elif kind < 0.95:
+            values.append(f"{d:02d}/{m + 1:02d}/{y}")
+        else:
+            values.append(rng.choice(['', None, 'tidak diketahui']))
+    return pd.Series(values, name='Tanggal_Tayang')
+
+def clean_text_basic_lama(text):
+    """Implementasi lama NewsPreprocessor.clean_text_basic (+ normalize_elongation), acuan golden test"""
+    text = str(text)
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'<.*?>', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'\d+', '', text)
+    text = re.sub(r'[%s]' % re.escape(string.punctuation), ' ', text)
+    text = re.sub(r'[^\x00-\x7f]', r'', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return re.sub(r'(.)\1{2,}', r'\1', text)
+
+def make_documents(n, seed=SEED):
+    """Sampel Isi_Berita dari KONTEN_FILE, atau artikel sintetis berisi URL/email/tag/angka/unicode"""
+    if dataset_exists(KONTEN_FILE):
+        col = 'Isi_Berita' if 'Isi_Berita' in dataset_columns(KONTEN_FILE) else 'content'
+        docs = read_dataset(KONTEN_FILE, columns=[col])[col].dropna()
+        return docs.sample(min(n, len(docs)), random_state=seed).tolist()
+
+    rng = random.Random(seed)
+    words = ("makan bergizi gratis sppg badan gizi nasional keracunan siswa sekolah anggaran "
+             "triliun menu dapur yayasan pengawasan hukum pangan halaman baca juga").split()
+    extras = ["https://news.detik.com/berita/d-123?x=1", "www.kompas.com", "<p>", "</b>", "redaksi@tempo.co",
+              "Rp58.000.000", "2025", "“kutipan”", "café", "١٢٣", "—", "hallooo", "!!!", "(BGN)", "\t", "\n\n", "\x1c"]
+    docs = []
+    for _ in range(n):
+        tokens = [rng.choice(words) if rng.random() < 0.85 else rng.choice(extras) for _ in range(rng.randint(50, 600))]
+        docs.append(" ".join(tokens))
+    return docs
+
+def bench_cleaner(n=N_DOCS):
+    """Return True kalau hasil cleaner baru identik dengan implementasi lama"""
+    from revisipreprocessingberita import NewsPreprocessor
+    docs = make_documents(n)
+    print(f"\n[2] Cleaner NewsPreprocessor ({len(docs):,} dokumen)")
+    processor = NewsPreprocessor()
+
+    def baru(texts):
+        return [processor.normalize_elongation(processor.clean_text_basic(t)) for t in texts]
+
+    old, t_old = timed(lambda texts: [clean_text_basic_lama(t) for t in texts], docs)
+    new, t_new = timed(baru, docs)
+    beda = sum(a != b for a, b in zip(old, new))
+    print(f"    clean_text    : lama {t_old / len(docs) * 1e3:7.3f} ms/dok | baru {t_new / len(docs) * 1e3:7.3f} ms/dok "
+          f"| x{t_old / t_new:5.1f} | golden {'OK (identik)' if beda == 0 else f'GAGAL ({beda} dokumen beda)'}")
+    return beda == 0
+
+def bench_tokenizer(n=N_DOCS):
+    """Return True kalau token regex sama dengan NLTK (atau NLTK tidak tersedia sehingga dilewati)"""
+    from revisipreprocessingberita import NewsPreprocessor, regex_tokenize, load_nltk_tokenizer
+    processor = NewsPreprocessor()
+    docs = [processor.normalize_elongation(processor.clean_text_basic(t)) for t in make_documents(n)]
+    print(f"\n[3] Tokenizer process_row ({len(docs):,} dokumen hasil clean)")
+    try:
+        word_tokenize = load_nltk_tokenizer()
+        old, t_old = timed(lambda texts: [word_tokenize(t) for t in texts], docs)
+    except Exception as e:
+        pesan = next((line.strip() for line in str(e).splitlines() if line.strip(" *")), type(e).__name__)
+        print(f"    NLTK tidak tersedia, perbandingan dilewati: {pesan}")
+        return True
+    new, t_new = timed(lambda texts: [regex_tokenize(t) for t in texts], docs)
+    beda = sum(a != b for a, b in zip(old, new))
+    print(f"    tokenize      : nltk {t_old / len(docs) * 1e3:7.3f} ms/dok | regex {t_new / len(docs) * 1e3:7.3f} ms/dok "
+          f"| x{t_old / t_new:5.1f} | token {'identik' if beda == 0 else f'BEDA di {beda} dokumen'}")
+    return beda == 0
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def same_values(a, b):
+    both_na = a.isna() & b.isna()
+    return ((a == b) | both_na).mean()
+
+def bench_tanggal(n=N_ROWS):
+    """Return True kalau kedua normalisasi tanggal baru 100% sama dengan versi per baris"""
+    col = make_date_column(n)
+    print(f"\n[1] Normalisasi tanggal ({n:,} baris, {col.nunique(dropna=False):,} string unik)")
+
+    old_iso, t_old = timed(lambda s: s.apply(perbaiki_tanggal), col)
+    new_iso, t_new = timed(normalize_to_iso, col, REFERENCE_DATE)
+    sama_iso = same_values(old_iso, new_iso)
+    print(f"    fix_tanggal   : per baris {t_old:7.2f}s | baru {t_new:7.2f}s "
+          f"| x{t_old / t_new:5.1f} | sama {sama_iso:.2%}")
+
+    old_dt, t_old = timed(parse_indonesian_date_lama, col)
+    new_dt, t_new = timed(parse_dates, col, REFERENCE_DATE)
+    sama_dt = same_values(old_dt, new_dt)
+    print(f"    parse tanggal : per baris {t_old:7.2f}s | baru {t_new:7.2f}s "
+          f"| x{t_old / t_new:5.1f} | sama {sama_dt:.2%}")
+    return sama_iso == 1 and sama_dt == 1
+
+def main():
+    print("==========================================")
+    print(" ⏱️  BENCHMARK OPTIMASI PIPELINE           ")
+    print("==========================================")
+    checks = {
+        'tanggal': bench_tanggal(),
+        'cleaner': bench_cleaner(),
+        'tokenizer': bench_tokenizer(),
+    }
+    gagal = [name for name, ok in checks.items() if not ok]
+    if gagal:
+        print(f"\n❌ Hasil tidak identik dengan acuan lama: {', '.join(gagal)}")
+        sys.exit(1)
+    print("\n✅ Semua hasil identik dengan acuan lama.")
+
+if __name__ == "__main__":
+    main()
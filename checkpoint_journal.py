@@ -0,0 +1,83 @@
+import json
+import os
+
+# Journal checkpoint append-only (JSON Lines) yang dipakai bersama oleh script scraping.
+# Setiap record baru cukup di-append 1 baris, jadi biaya checkpoint O(1) per record.
+# File CSV final hanya ditulis sekali di akhir lewat compact_to_csv().
+
+class JsonlJournal:
+    """Journal append-only: 1 baris JSON = 1 record (link / artikel)"""
+    def __init__(self, path, fsync_every=10):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = None
+        self._unsynced = 0
+
+    def exists(self):
+        return os.path.exists(self.path) and os.path.getsize(self.path) > 0
+
+    def size(self):
+        """Ukuran file journal dalam byte (posisi akhir record yang sudah ditulis)"""
+        if self._file is not None:
+            self._file.flush()
+        return os.path.getsize(self.path) if os.path.exists(self.path) else 0
+
+    def replay(self, offset=0):
+        """
+        Baca ulang record sesuai urutan tulis, mulai dari byte `offset` (harus awal baris, mis. hasil size()).
+        Baris rusak (crash saat menulis) di-skip.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line.decode('utf-8'))
+                except ValueError:
+                    continue
+
+    def _open(self):
+        # Kalau proses sebelumnya mati di tengah baris, tutup dulu baris yang terpotong
+        # supaya record baru tidak ikut rusak.
+        needs_newline = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                needs_newline = f.read(1) != b"\n"
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write("\n")
+
+    def append(self, record):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+            self._unsynced = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def compact_to_csv(df, output_file):
+    """Tulis dataset final ke CSV secara atomik (tulis ke file sementara lalu rename)"""
+    tmp_file = output_file + ".tmp"
+    df.to_csv(tmp_file, index=False, encoding='utf-8-sig')
+    os.replace(tmp_file, output_file)
@@ -0,0 +1,63 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from tqdm import tqdm
+
+# Statistik korpus satu kali jalan (streaming): tiap dokumen di-split sekali saja,
+# worker menghitung Counter kata + histogram panjang dokumen per chunk, lalu hasilnya digabung.
+# Memori sebanding dengan ukuran vocabulary, bukan jumlah token di korpus.
+
+def _chunk_stats(texts):
+    """(Counter kata, Counter panjang dokumen, total token) untuk 1 chunk teks"""
+    words = Counter()
+    lengths = Counter()
+    total = 0
+    for text in texts:
+        tokens = str(text).split()
+        words.update(tokens)
+        lengths[len(tokens)] += 1
+        total += len(tokens)
+    return words, lengths, total
+
+def _iter_chunks(texts, chunk_size):
+    chunk = []
+    for text in texts:
+        chunk.append(text)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def corpus_stats(texts, workers=1, chunk_size=2000, top_k=50, desc="Counting Words"):
+    """
+    Hitung statistik korpus secara eksak (tanpa sampling).
+    Return dict: n_docs, n_tokens, vocabulary, top_words (list (kata, jumlah) sebanyak top_k),
+    length_hist (Counter panjang dokumen -> jumlah dokumen).
+    """
+    words = Counter()
+    lengths = Counter()
+    total = 0
+    n_docs = len(texts) if hasattr(texts, '__len__') else None
+    with tqdm(total=n_docs, desc=desc) as pbar:
+        def merge(result):
+            nonlocal total
+            chunk_words, chunk_lengths, chunk_total = result
+            words.update(chunk_words)
+            lengths.update(chunk_lengths)
+            total += chunk_total
+            pbar.update(sum(chunk_lengths.values()))
+
+        if workers <= 1:
+            for chunk in _iter_chunks(texts, chunk_size):
+                merge(_chunk_stats(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for result in executor.map(_chunk_stats, _iter_chunks(texts, chunk_size)):
+                    merge(result)
+    return {
+        "n_docs": sum(lengths.values()),
+        "n_tokens": total,
+        "vocabulary": len(words),
+        "top_words": words.most_common(top_k),
+        "length_hist": lengths,
+    }
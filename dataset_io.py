@@ -0,0 +1,69 @@
+import os
+import pandas as pd
+from checkpoint_journal import compact_to_csv
+
+# Baca/tulis dataset antar tahap pipeline.
+# Format utama Parquet (kolumnar, bisa baca sebagian kolom saja); CSV tetap ditulis sebagai ekspor.
+# Nama dataset tetap ditulis dengan ekstensi .csv di konfigurasi tiap script,
+# file Parquet-nya berada di sebelahnya dengan nama yang sama (.parquet).
+# Kalau pyarrow tidak terpasang, semua otomatis kembali ke CSV.
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+def parquet_path(path):
+    return os.path.splitext(path)[0] + ".parquet"
+
+def csv_path(path):
+    return os.path.splitext(path)[0] + ".csv"
+
+def _use_parquet(path):
+    """Pakai Parquet kalau ada dan tidak lebih lama dari CSV-nya (CSV bisa saja diedit manual)"""
+    pq, csv = parquet_path(path), csv_path(path)
+    if not PARQUET_AVAILABLE or not os.path.exists(pq):
+        return False
+    return not os.path.exists(csv) or os.path.getmtime(pq) >= os.path.getmtime(csv)
+
+def dataset_exists(path):
+    return os.path.exists(csv_path(path)) or (PARQUET_AVAILABLE and os.path.exists(parquet_path(path)))
+
+def dataset_file(path):
+    """File yang benar-benar dibaca read_dataset (Parquet atau CSV)"""
+    return parquet_path(path) if _use_parquet(path) else csv_path(path)
+
+def dataset_columns(path):
+    """Nama kolom dataset tanpa membaca isinya"""
+    if _use_parquet(path):
+        import pyarrow.parquet as pq
+        return pq.read_schema(parquet_path(path)).names
+    return pd.read_csv(csv_path(path), nrows=0).columns.tolist()
+
+def read_dataset(path, columns=None):
+    """
+    Baca dataset (Parquet kalau tersedia, kalau tidak CSV).
+    columns: daftar kolom yang dibutuhkan saja (None = semua kolom).
+    """
+    if _use_parquet(path):
+        return pd.read_parquet(parquet_path(path), columns=columns)
+    return pd.read_csv(csv_path(path), usecols=columns)
+
+def write_dataset(df, path, export_csv=True):
+    """
+    Tulis dataset secara atomik: Parquet sebagai format utama, plus ekspor CSV (opsional).
+    Tanpa pyarrow, CSV selalu ditulis.
+    """
+    # CSV ditulis lebih dulu supaya Parquet tidak lebih lama darinya (lihat _use_parquet)
+    if export_csv or not PARQUET_AVAILABLE:
+        compact_to_csv(df, csv_path(path))
+    if PARQUET_AVAILABLE:
+        out = df.copy()
+        # Kolom object campuran (mis. angka & teks) disimpan sebagai teks supaya skema Parquet konsisten
+        for col in out.columns[out.dtypes == object]:
+            out[col] = out[col].where(out[col].isna(), out[col].astype(str))
+        pq = parquet_path(path)
+        tmp_file = pq + ".tmp"
+        out.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, pq)
@@ -1,15 +1,25 @@
 import pandas as pd
 import re
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from tanggal_utils import normalize_to_iso
 
 # --- KONFIGURASI ---
 # Tanggal Patokan (Saat kamu melakukan scraping)
 # Ganti sesuai tanggal terakhir kamu run script scraping
 CURRENT_DATE = datetime(2025, 11, 30) 
 
+CHUNK_SIZE = 50_000  # Baris per batch saat streaming (memori tetap rata berapapun ukuran file)
+FILE_WORKERS = min(4, os.cpu_count() or 1)  # File CSV yang diproses paralel
+KOLOM_TANGGAL = ['Tanggal', 'Tanggal_Tayang', 'Date', 'Waktu', 'date', 'tanggal']
+
 def perbaiki_tanggal(teks_tanggal):
-    """Fungsi sakti pengubah tanggal 'alay' jadi standar ISO"""
+    """
+    Fungsi sakti pengubah tanggal 'alay' jadi standar ISO (per baris).
+    main() memakai versi vectorized tanggal_utils.normalize_to_iso; fungsi ini
+    disimpan sebagai acuan di benchmark_pipeline.py.
+    """
     if pd.isna(teks_tanggal) or str(teks_tanggal).strip() == "":
         return ""
     
@@ -77,6 +87,35 @@ def perbaiki_tanggal(teks_tanggal):
 
     return teks_tanggal # Kalau gagal, kembalikan aslinya
 
+def proses_file(filename, chunksize=CHUNK_SIZE):
+    """
+    Perbaiki kolom tanggal 1 file CSV secara streaming (per batch chunksize baris).
+    Hasil ditulis ke file sementara lalu di-rename, jadi file asli tidak pernah setengah tertulis.
+    Return pesan status untuk dicetak proses utama.
+    """
+    # Cari nama kolom tanggal yang valid (cukup baca header)
+    header = pd.read_csv(filename, nrows=0).columns
+    col_target = next((col for col in KOLOM_TANGGAL if col in header), None)
+    if not col_target:
+        return f"⚠️  {filename}: Tidak ada kolom tanggal di file ini. Skip."
+
+    tmp_file = filename + ".tmp"
+    total = 0
+    try:
+        # dtype=str: kolom lain ditulis ulang apa adanya (tidak berubah tipe antar batch)
+        with open(tmp_file, 'w', encoding='utf-8-sig', newline='') as f:
+            for i, chunk in enumerate(pd.read_csv(filename, dtype=str, chunksize=chunksize)):
+                chunk[col_target] = normalize_to_iso(chunk[col_target], CURRENT_DATE)
+                chunk.to_csv(f, index=False, header=(i == 0))
+                total += len(chunk)
+        # Simpan (Overwrite file lama biar gak menuh-menuhin folder), atomik
+        os.replace(tmp_file, filename)
+    except Exception:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return f"✅ {filename}: kolom '{col_target}' diperbaiki ({total} baris)."
+
 def main():
     # Cari semua file CSV di folder ini
     files = [f for f in os.listdir('.') if f.endswith('.csv') and 'dataset' in f or 'lampiran' in f]
@@ -85,37 +124,20 @@ def main():
     for f in files: print(f"   - {f}")
     print("-" * 30)
 
-    for filename in files:
-        print(f"📂 Memproses: {filename}...")
-        try:
-            df = pd.read_csv(filename)
-            
-            # Cari nama kolom tanggal yang valid
-            col_target = None
-            possible_names = ['Tanggal', 'Tanggal_Tayang', 'Date', 'Waktu', 'date', 'tanggal']
-            
-            for col in possible_names:
-                if col in df.columns:
-                    col_target = col
-                    break
-            
-            if col_target:
-                print(f"   🛠️  Memperbaiki kolom '{col_target}'...")
-                # Terapkan perbaikan
-                df[col_target] = df[col_target].apply(perbaiki_tanggal)
-                
-                # Simpan (Overwrite file lama biar gak menuh-menuhin folder)
-                df.to_csv(filename, index=False, encoding='utf-8-sig')
-                print(f"   ✅ Selesai disimpan.")
-            else:
-                print(f"   ⚠️  Tidak ada kolom tanggal di file ini. Skip.")
-                
-        except Exception as e:
-            print(f"   ❌ Gagal memproses file ini: {e}")
+    if files:
+        print(f"📂 Memproses {len(files)} file dengan {min(FILE_WORKERS, len(files))} proses "
+              f"(batch {CHUNK_SIZE} baris)...")
+        with ProcessPoolExecutor(max_workers=min(FILE_WORKERS, len(files))) as executor:
+            futures = {executor.submit(proses_file, filename, CHUNK_SIZE): filename for filename in files}
+            for future in as_completed(futures):
+                try:
+                    print(f"   {future.result()}")
+                except Exception as e:
+                    print(f"   ❌ {futures[future]}: Gagal memproses file ini: {e}")
 
     print("\n" + "="*50)
     print("🎉 SEMUA TANGGAL SUDAH DIPERBAIKI KE FORMAT YYYY-MM-DD")
     print("="*50)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import requests
+from requests.adapters import HTTPAdapter
+
+# Helper HTTP bersama untuk script scraping:
+# - 1 session dengan connection pool per host (keep-alive, tidak buka koneksi baru tiap artikel)
+# - cache HTML mentah di disk (key = hash URL) supaya parsing bisa diulang offline
+
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36'),
+    'Accept-Language': 'id-ID,id;q=0.9,en;q=0.8',
+}
+
+def build_session(pool_connections=200, pool_maxsize=4):
+    """
+    Session yang dipakai bersama semua thread.
+    pool_connections : jumlah host yang pool-nya disimpan
+    pool_maxsize     : koneksi keep-alive yang disimpan per host
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+class HtmlCache:
+    """Cache HTML mentah (bytes, gzip) di disk. Nama file = sha256(url)."""
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        key = hashlib.sha256(str(url).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".html.gz")
+
+    def get(self, url):
+        path = self._path(url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, 'rb') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None # File cache rusak dianggap miss
+
+    def put(self, url, html):
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Nama file sementara unik per panggilan (aman dipakai banyak thread/proses sekaligus)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                f.write(html)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def fetch_html(session, url, cache=None, offline=False, timeout=15):
+    """
+    Ambil HTML mentah (bytes) sebuah URL. Cache dicek lebih dulu.
+    Return (status_code, html). Mode offline yang tidak ketemu di cache -> (None, None).
+    """
+    if cache is not None:
+        html = cache.get(url)
+        if html is not None:
+            return 200, html
+    if offline:
+        return None, None
+
+    response = session.get(url, timeout=timeout)
+    html = response.content
+    if response.status_code == 200 and cache is not None:
+        cache.put(url, html)
+    return response.status_code, html
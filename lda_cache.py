@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from gensim import corpora
+from gensim.models.phrases import Phraser
+
+# Cache artefak persiapan LDA (token hasil filter, phraser bigram, Dictionary, corpus BoW)
+# di folder <cache_dir>/<fingerprint>/. Fingerprint = hash isi file input + setting
+# stopwords/bigram/filter_extremes, jadi perubahan data atau setting otomatis membangun ulang cache.
+# Corpus BoW disimpan sebagai array numpy format CSR (indptr, id kata, jumlah) dan dimuat dengan
+# mmap: tidak ada parsing teks tiap pass, dan worker sweep yang memuat cache yang sama berbagi
+# halaman file lewat page cache OS (bukan salinan corpus per proses).
+# Dictionary & token tetap dimuat biasa (Dictionary hanya berisi dict Python, tidak bisa di-mmap).
+
+TOKENS_FILE = "tokens.txt"
+DICTIONARY_FILE = "dictionary.gensim"
+CORPUS_INDPTR_FILE = "corpus_indptr.npy"
+CORPUS_IDS_FILE = "corpus_ids.npy"
+CORPUS_COUNTS_FILE = "corpus_counts.npy"
+CORPUS_FILES = (CORPUS_INDPTR_FILE, CORPUS_IDS_FILE, CORPUS_COUNTS_FILE)
+PHRASER_FILE = "phraser.gensim"
+
+def file_hash(path, block_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def artifacts_fingerprint(input_file, settings):
+    """Hash isi file input + setting persiapan (dict yang bisa di-JSON-kan)"""
+    payload = json.dumps({'input': file_hash(input_file), 'settings': settings}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+class MmapCorpus:
+    """Corpus BoW read-only di atas array CSR ter-mmap; tiap dokumen = list (id kata, jumlah)"""
+    def __init__(self, folder, mmap_mode='r'):
+        self.indptr = np.load(os.path.join(folder, CORPUS_INDPTR_FILE), mmap_mode=mmap_mode)
+        self.ids = np.load(os.path.join(folder, CORPUS_IDS_FILE), mmap_mode=mmap_mode)
+        self.counts = np.load(os.path.join(folder, CORPUS_COUNTS_FILE), mmap_mode=mmap_mode)
+
+    @staticmethod
+    def save(folder, corpus):
+        indptr = [0]
+        ids = []
+        counts = []
+        for doc in corpus:
+            for word_id, count in doc:
+                ids.append(word_id)
+                counts.append(count)
+            indptr.append(len(ids))
+        np.save(os.path.join(folder, CORPUS_INDPTR_FILE), np.array(indptr, dtype=np.int64))
+        np.save(os.path.join(folder, CORPUS_IDS_FILE), np.array(ids, dtype=np.int32))
+        np.save(os.path.join(folder, CORPUS_COUNTS_FILE), np.array(counts, dtype=np.float32))
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, i):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return list(zip(self.ids[start:end].tolist(), self.counts[start:end].tolist()))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+class LdaArtifacts:
+    """Simpan/muat artefak LDA untuk 1 fingerprint"""
+    def __init__(self, cache_dir, fingerprint):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.path = os.path.join(cache_dir, fingerprint)
+
+    def file(self, name):
+        return os.path.join(self.path, name)
+
+    def exists(self):
+        return all(os.path.exists(self.file(name)) for name in (TOKENS_FILE, DICTIONARY_FILE) + CORPUS_FILES)
+
+    def load(self):
+        """Return (data_tokens, id2word, corpus (MmapCorpus), phraser atau None)"""
+        with open(self.file(TOKENS_FILE), encoding='utf-8') as f:
+            data_tokens = [line.split() for line in f]
+        id2word = corpora.Dictionary.load(self.file(DICTIONARY_FILE))
+        corpus = MmapCorpus(self.path)
+        phraser = Phraser.load(self.file(PHRASER_FILE)) if os.path.exists(self.file(PHRASER_FILE)) else None
+        return data_tokens, id2word, corpus, phraser
+
+    def save(self, data_tokens, id2word, corpus, phraser=None):
+        """Tulis ke folder sementara lalu rename, dan hapus cache fingerprint lama"""
+        tmp_path = self.path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        with open(os.path.join(tmp_path, TOKENS_FILE), "w", encoding='utf-8') as f:
+            for tokens in data_tokens:
+                f.write(" ".join(tokens) + "\n")
+        id2word.save(os.path.join(tmp_path, DICTIONARY_FILE))
+        MmapCorpus.save(tmp_path, corpus)
+        if phraser is not None:
+            phraser.save(os.path.join(tmp_path, PHRASER_FILE))
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(tmp_path, self.path)
+        for name in os.listdir(self.cache_dir):
+            if name != self.fingerprint:
+                shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
@@ -0,0 +1,114 @@
+import re
+import zlib
+import numpy as np
+from tqdm import tqdm
+
+# Deteksi berita hampir-duplikat (mis. berita wire yang dimuat ulang banyak media dengan sedikit edit)
+# pakai MinHash + LSH: tiap dokumen diringkas jadi signature MinHash dari shingle kata,
+# lalu hanya pasangan yang jatuh di bucket LSH yang sama yang dibandingkan (tidak O(n^2)).
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+TOKEN_PATTERN = re.compile(r'\w+')
+
+def shingle_hashes(text, shingle_size=5):
+    """Hash 32-bit unik dari shingle (n-gram kata) sebuah teks"""
+    tokens = TOKEN_PATTERN.findall(str(text).lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    token_ids = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in tokens), dtype=np.uint64, count=len(tokens))
+    if len(tokens) < shingle_size:
+        shingle_size = len(tokens)
+    # Gabungkan hash token dalam 1 jendela secara polinomial (overflow uint64 disengaja)
+    windows = np.lib.stride_tricks.sliding_window_view(token_ids, shingle_size)
+    combined = np.zeros(len(windows), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for i in range(shingle_size):
+            combined = combined * np.uint64(1000003) + windows[:, i]
+    return np.unique(combined & MAX_HASH)
+
+class MinHasher:
+    """Signature MinHash dengan num_perm permutasi (a*x + b) mod prime"""
+    def __init__(self, num_perm=128, seed=42):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        if len(hashes) == 0:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        # a, x < 2^32 -> a*x < 2^64, jadi perkalian aman di uint64 sebelum di-mod
+        with np.errstate(over='ignore'):
+            perm = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % MERSENNE_PRIME
+        return (perm & MAX_HASH).min(axis=1)
+
+def _find_root(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def find_near_duplicates(texts, threshold=0.8, num_perm=128, bands=16, shingle_size=5, seed=42):
+    """
+    Kelompokkan dokumen yang mirip (estimasi Jaccard shingle >= threshold).
+    Return array cluster id (0..n_cluster-1) dengan urutan sama seperti `texts`.
+    """
+    texts = list(texts)
+    n = len(texts)
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm=rows * bands, seed=seed)
+
+    signatures = np.empty((n, rows * bands), dtype=np.uint64)
+    empty = np.zeros(n, dtype=bool)
+    for i, text in enumerate(tqdm(texts, desc="MinHash")):
+        hashes = shingle_hashes(text, shingle_size)
+        empty[i] = len(hashes) == 0
+        signatures[i] = hasher.signature(hashes)
+
+    # Union-find atas pasangan kandidat dari bucket LSH, diverifikasi dengan estimasi Jaccard
+    parent = np.arange(n)
+    for band in range(bands):
+        buckets = {}
+        band_sig = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(n):
+            if empty[i]:
+                continue
+            buckets.setdefault(band_sig[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Semua pasangan di bucket diverifikasi (bukan hanya terhadap anggota pertama),
+            # supaya dokumen mirip yang tidak mirip dengan members[0] tetap tergabung
+            member_sigs = signatures[members]
+            for pos, first in enumerate(members[:-1]):
+                similarity = np.mean(member_sigs[pos + 1:] == member_sigs[pos], axis=1)
+                for offset in np.flatnonzero(similarity >= threshold):
+                    other = members[pos + 1 + offset]
+                    root_a, root_b = _find_root(parent, first), _find_root(parent, other)
+                    if root_a != root_b:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    roots = np.array([_find_root(parent, i) for i in range(n)])
+    _, cluster_ids = np.unique(roots, return_inverse=True)
+    return cluster_ids
+
+def drop_near_duplicates(df, text_col, cluster_col='Cluster_Duplikat', **kwargs):
+    """
+    Tambah kolom cluster id ke df lalu sisakan 1 wakil per cluster
+    (teks terpanjang, kalau sama panjang ambil yang muncul pertama).
+    Return (df_wakil, jumlah_cluster_yang_berisi_duplikat).
+    """
+    df = df.copy()
+    df[cluster_col] = find_near_duplicates(df[text_col].astype(str), **kwargs)
+    lengths = df[text_col].astype(str).str.len().to_numpy()
+    order = np.lexsort((np.arange(len(df)), -lengths))
+    keep = np.zeros(len(df), dtype=bool)
+    seen_clusters = set()
+    for i in order:
+        cluster = df[cluster_col].iat[i]
+        if cluster not in seen_clusters:
+            seen_clusters.add(cluster)
+            keep[i] = True
+    sizes = df[cluster_col].value_counts()
+    return df[keep], int((sizes > 1).sum())
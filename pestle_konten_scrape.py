@@ -1,91 +1,419 @@
-import pandas as pd
 from newspaper import Article
 from tqdm import tqdm
 import os
 import time
-import random
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+from checkpoint_journal import JsonlJournal
+from dataset_io import dataset_exists, read_dataset, write_dataset
+from http_client import build_session, HtmlCache, fetch_html
 
 # --- KONFIGURASI ---
 INPUT_FILE = "pestle_link.csv"  # File CSV hasil tahap sebelumnya
 OUTPUT_FILE = "pestle_konten.csv" # File output yang ada isi beritanya
+JOURNAL_FILE = "pestle_konten.journal.jsonl" # Checkpoint append-only (sumber resume)
+EXPORT_CSV = True  # Output utama Parquet (kalau pyarrow ada); False = tidak menulis ekspor CSV
 
-def download_article_content(url):
+# Konfigurasi download paralel
+MAX_WORKERS = 16     # Batas koneksi global (jumlah thread download sekaligus)
+MAX_PER_DOMAIN = 2   # Batas koneksi simultan ke satu domain berita
+JOURNAL_FSYNC_EVERY = 10  # fsync journal ke disk setiap N artikel selesai
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # Proses parsing newspaper3k (CPU-bound)
+HTML_QUEUE_SIZE = 64 # Maks HTML yang menunggu di-parse (fetcher tertahan kalau penuh)
+
+# Konfigurasi HTTP & cache HTML mentah
+HTML_CACHE_DIR = "html_cache"  # Cache HTML per URL (gzip), dipakai ulang saat re-run
+OFFLINE_MODE = False  # True = parsing ulang hanya dari cache, tanpa akses jaringan
+                      # (hapus journal dulu kalau ingin semua artikel di-parse ulang)
+REQUEST_TIMEOUT = 15  # Detik
+
+# Session bersama (connection pool per host) & cache, dipakai semua thread download
+HTTP_SESSION = build_session(pool_maxsize=MAX_PER_DOMAIN)
+HTML_CACHE = HtmlCache(HTML_CACHE_DIR)
+
+# Konfigurasi politeness per host (token bucket + backoff adaptif)
+HOST_RATE = 1.0       # Rata-rata request per detik ke satu host
+HOST_BURST = 3        # Kapasitas bucket (boleh burst sebanyak ini di awal)
+MIN_HOST_RATE = 0.05  # Batas bawah rate setelah host berkali-kali menolak
+BACKOFF_BASE = 5.0    # Jeda (detik) pertama setelah kena 429/5xx, lalu dikali 2
+BACKOFF_MAX = 300.0   # Jeda maksimum untuk satu host
+MAX_RETRIES = 3       # Berapa kali link yang kena 429/5xx dicoba ulang
+
+def parse_article_html(url, html):
+    """Parsing HTML mentah jadi teks berita (newspaper3k, tanpa akses jaringan)"""
+    article = Article(url, language='id')
+    article.download(input_html=html)
+    article.parse()
+    
+    # Kita ambil teksnya, dan ganti baris baru dengan spasi biar rapi di CSV
+    text = article.text.replace('\n', ' ').replace('\r', ' ')
+    
+    # Validasi: Kalau teks terlalu pendek (mungkin gagal/cuma loading), anggap gagal
+    if len(text) < 50: 
+        return "ERROR: Konten terlalu pendek/Gagal Parsing"
+        
+    return text
+
+def parse_article_safe(url, html):
+    """Versi aman parse_article_html untuk dijalankan di process pool (error jadi string)"""
+    try:
+        return parse_article_html(url, html)
+    except Exception as e:
+        return f"ERROR: {str(e)}"
+
+def fetch_article_html(url):
     """
-    Fungsi 'Magic' untuk menyedot isi berita tanpa pusing mikirin HTML
+    Tahap fetch: ambil HTML mentah lewat session bersama (keep-alive) + cache disk.
+    Return (status, html, error). error berisi pesan "ERROR: ..." kalau gagal.
+    html dan error sama-sama None = tidak ada di cache saat mode offline (belum dicoba, bukan gagal).
     """
     try:
-        article = Article(url, language='id')
-        article.download()
-        article.parse()
-        
-        # Kita ambil teksnya, dan ganti baris baru dengan spasi biar rapi di CSV
-        text = article.text.replace('\n', ' ').replace('\r', ' ')
-        
-        # Validasi: Kalau teks terlalu pendek (mungkin gagal/cuma loading), anggap gagal
-        if len(text) < 50: 
-            return "ERROR: Konten terlalu pendek/Gagal Parsing"
-            
-        return text
+        status, html = fetch_html(HTTP_SESSION, url, cache=HTML_CACHE, offline=OFFLINE_MODE, timeout=REQUEST_TIMEOUT)
     except Exception as e:
-        return f"ERROR: {str(e)}"
+        return None, None, f"ERROR: {str(e)}"
+    if html is None:
+        return None, None, None
+    if status != 200:
+        return status, None, f"ERROR: {status} {'Server' if status >= 500 else 'Client'} Error for url: {url}"
+    return status, html, None
+
+def download_article_content(url):
+    """
+    Fungsi 'Magic' untuk menyedot isi berita tanpa pusing mikirin HTML.
+    Versi satu-per-satu (fetch + parse di thread yang sama), berguna untuk cek 1 link.
+    """
+    status, html, error = fetch_article_html(url)
+    if error is not None:
+        return error
+    if html is None:
+        return "ERROR: Tidak ada di cache (mode offline)"
+    return parse_article_safe(url, html)
+
+def get_domain(url):
+    return urlparse(str(url)).netloc.lower()
+
+class TokenBucket:
+    """Token bucket sederhana: 1 token = izin 1 request"""
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, now):
+        """Detik yang harus ditunggu sampai 1 token tersedia (0 = bisa langsung)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+class HostState:
+    def __init__(self, rate, burst):
+        self.queue = deque()
+        self.bucket = TokenBucket(rate, burst)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.failures = 0
+
+class HostScheduler:
+    """
+    Penjadwal politeness: link dikelompokkan per host lalu dibagikan bergiliran (round-robin)
+    ke thread download. Tiap host punya token bucket sendiri, dan kalau host membalas
+    429/5xx, host itu di-pause (exponential backoff) serta rate-nya diturunkan.
+    """
+    def __init__(self, tasks, rate=HOST_RATE, burst=HOST_BURST, max_per_host=MAX_PER_DOMAIN):
+        self.rate = rate
+        self.max_per_host = max_per_host
+        self.hosts = {}
+        self.retries = {}
+        self.pending = 0
+        self.stopped = False
+        self._cond = threading.Condition()
+
+        for index, url in tasks:
+            host = get_domain(url)
+            if host not in self.hosts:
+                self.hosts[host] = HostState(rate, burst)
+            self.hosts[host].queue.append((index, url))
+            self.pending += 1
+        self._ring = deque(self.hosts.keys())
+
+    def next_task(self):
+        """Ambil (index, url, host) berikutnya yang boleh di-request. None kalau semua beres."""
+        with self._cond:
+            while True:
+                if self.pending == 0 or self.stopped:
+                    return None
+                now = time.monotonic()
+                wait = None
+                for _ in range(len(self._ring)):
+                    host = self._ring.popleft()
+                    state = self.hosts[host]
+                    if not state.queue:
+                        # Host yang antriannya habis dibuang dari giliran,
+                        # kecuali masih ada request jalan (bisa saja di-retry)
+                        if state.in_flight > 0:
+                            self._ring.append(host)
+                        continue
+                    self._ring.append(host)
+                    if state.in_flight >= self.max_per_host:
+                        continue
+
+                    delay = state.blocked_until - now
+                    if delay <= 0:
+                        delay = state.bucket.wait_time(now)
+                    if delay <= 0:
+                        state.bucket.consume()
+                        state.in_flight += 1
+                        index, url = state.queue.popleft()
+                        return index, url, host
+                    wait = delay if wait is None else min(wait, delay)
+
+                # Belum ada host yang siap: tunggu token berikutnya / ada request yang selesai
+                self._cond.wait(timeout=wait)
+
+    def report(self, host, index, url, status):
+        """Lapor hasil request. Return True kalau link dimasukkan lagi ke antrian (retry)."""
+        with self._cond:
+            state = self.hosts[host]
+            state.in_flight -= 1
+            retry = False
+
+            if status is not None and (status == 429 or status >= 500):
+                # Host kewalahan: pause dulu dan turunkan rate (multiplicative decrease)
+                state.failures += 1
+                backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (state.failures - 1))
+                state.blocked_until = time.monotonic() + backoff
+                state.bucket.rate = max(MIN_HOST_RATE, state.bucket.rate / 2)
+
+                attempt = self.retries.get(index, 0)
+                if attempt < MAX_RETRIES:
+                    self.retries[index] = attempt + 1
+                    state.queue.append((index, url))
+                    retry = True
+            else:
+                # Request lancar: reset backoff, pulihkan rate pelan-pelan (additive increase)
+                state.failures = 0
+                state.bucket.rate = min(self.rate, state.bucket.rate + self.rate * 0.1)
+
+            if not retry:
+                self.pending -= 1
+            self._cond.notify_all()
+            return retry
+
+    def stop(self):
+        with self._cond:
+            self.stopped = True
+            self._cond.notify_all()
+
+class PipelineStats:
+    """Metrik progres & backpressure pipeline fetch -> parse (ditampilkan di progress bar)"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fetched = 0          # HTML berhasil diambil
+        self.fetch_failed = 0     # Gagal di tahap fetch (timeout, 404, dst)
+        self.not_cached = 0       # Mode offline: tidak ada di cache, dilewati (tetap kosong untuk run online)
+        self.parsed = 0           # Selesai di-parse process pool
+        self.fetch_blocked = 0.0  # Detik fetcher tertahan karena antrian HTML penuh (parser = bottleneck)
+        self.parse_starved = 0.0  # Detik parser menganggur karena antrian kosong (jaringan = bottleneck)
+        self.queue_depth = 0
+        self.parse_in_flight = 0
+
+    def add(self, name, value=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def summary(self):
+        return {
+            'fetch': self.fetched, 'gagal': self.fetch_failed, 'tdk_cache': self.not_cached, 'parse': self.parsed,
+            'antrian': self.queue_depth, 'parsing': self.parse_in_flight,
+            'fetch_blok': f"{self.fetch_blocked:.0f}s", 'parse_idle': f"{self.parse_starved:.0f}s"
+        }
+
+def download_concurrent(tasks, stats=None, max_workers=MAX_WORKERS, parse_workers=PARSE_WORKERS):
+    """
+    Pipeline 2 tahap:
+      1. Fetch  : thread pool + HostScheduler mengisi antrian HTML yang dibatasi (HTML_QUEUE_SIZE).
+                  Kalau antrian penuh, fetcher tertahan (backpressure) sampai parser mengejar.
+      2. Parse  : ProcessPoolExecutor mem-parsing HTML jadi Isi_Berita (CPU-bound, skala per core).
+    tasks : list of (index, url)
+    Yield (index, content) sesuai urutan selesai (bukan urutan input).
+    content None = tidak ada di cache (mode offline): belum dicoba, jangan dicatat ke journal.
+    """
+    stats = stats if stats is not None else PipelineStats()
+    if OFFLINE_MODE:
+        # Semua dibaca dari cache lokal, tidak perlu jeda politeness
+        scheduler = HostScheduler(tasks, rate=1e9, burst=max_workers, max_per_host=max_workers)
+    else:
+        scheduler = HostScheduler(tasks)
+    html_queue = queue.Queue(maxsize=HTML_QUEUE_SIZE)
+    print(f"🌐 {len(scheduler.hosts)} host unik, dijadwalkan bergiliran (rate {HOST_RATE}/detik per host).")
+    print(f"⚙️  Parsing di {parse_workers} proses, antrian HTML maks {HTML_QUEUE_SIZE}.")
+
+    def fetcher():
+        try:
+            while True:
+                task = scheduler.next_task()
+                if task is None:
+                    break
+                index, url, host = task
+                status, html, error = fetch_article_html(url)
+                if scheduler.report(host, index, url, status):
+                    continue # Masuk antrian retry host
+                if error is not None:
+                    stats.add('fetch_failed')
+                elif html is None:
+                    stats.add('not_cached')
+                else:
+                    stats.add('fetched')
+                t0 = time.monotonic()
+                html_queue.put((index, url, html, error))
+                stats.add('fetch_blocked', time.monotonic() - t0)
+        finally:
+            html_queue.put(None)
+
+    threads = [threading.Thread(target=fetcher, daemon=True) for _ in range(max_workers)]
+    for t in threads:
+        t.start()
+
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+    in_flight = {}
+    max_in_flight = parse_workers * 2
+    finished = 0
+    try:
+        while finished < len(threads) or in_flight:
+            # 1. Isi process pool dari antrian HTML selama slot parsing masih ada
+            while finished < len(threads) and len(in_flight) < max_in_flight:
+                idle = not in_flight
+                t0 = time.monotonic()
+                try:
+                    # Pakai timeout supaya Ctrl+C tetap bisa masuk (terutama di Windows)
+                    item = html_queue.get(timeout=0.5) if idle else html_queue.get_nowait()
+                except queue.Empty:
+                    item = False
+                if idle:
+                    stats.add('parse_starved', time.monotonic() - t0)
+                if item is False:
+                    break
+                if item is None:
+                    finished += 1
+                    continue
+                index, url, html, error = item
+                if error is not None or html is None:
+                    yield index, error
+                    continue
+                in_flight[executor.submit(parse_article_safe, url, html)] = index
+
+            stats.queue_depth = html_queue.qsize()
+            stats.parse_in_flight = len(in_flight)
+
+            # 2. Ambil hasil parsing yang sudah selesai
+            if in_flight:
+                done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        content = f"ERROR: {str(e)}"
+                    stats.add('parsed')
+                    yield index, content
+    finally:
+        scheduler.stop()
+        # Batalkan parsing yang belum jalan secara manual (cancel_futures baru ada di Python 3.9)
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def load_links_with_journal(journal):
+    """
+    Susun DataFrame kerja dari file link + replay journal.
+    Artikel yang sudah pernah di-download diambil dari journal, bukan dari CSV output.
+    """
+    # Migrasi satu kali: hasil lama yang masih berupa CSV dimasukkan ke journal
+    if not journal.exists() and dataset_exists(OUTPUT_FILE):
+        print(f"📦 Migrasi '{OUTPUT_FILE}' lama ke journal '{JOURNAL_FILE}'...")
+        legacy = read_dataset(OUTPUT_FILE, columns=['Link', 'Isi_Berita', 'Status_Scrape'])
+        legacy['Isi_Berita'] = legacy['Isi_Berita'].fillna("").astype(str)
+        for row in legacy[legacy['Isi_Berita'] != ""].itertuples(index=False):
+            journal.append({'Link': row.Link, 'Isi_Berita': row.Isi_Berita, 'Status_Scrape': row.Status_Scrape})
+        journal.close()
+
+    if dataset_exists(INPUT_FILE):
+        print(f"📂 Membaca file sumber: '{INPUT_FILE}'...")
+        df = read_dataset(INPUT_FILE)
+    elif dataset_exists(OUTPUT_FILE):
+        df = read_dataset(OUTPUT_FILE)
+    else:
+        print(f"❌ File input '{INPUT_FILE}' tidak ditemukan!")
+        return None
+
+    # Bikin kolom baru kosong, lalu isi dari journal (record terakhir per link yang menang)
+    done = {rec['Link']: rec for rec in journal.replay()}
+    if done:
+        print(f"📂 Journal '{JOURNAL_FILE}' ditemukan. Melanjutkan scraping konten ({len(done)} artikel tercatat)...")
+    df['Isi_Berita'] = df['Link'].map({link: rec['Isi_Berita'] for link, rec in done.items()})
+    df['Status_Scrape'] = df['Link'].map({link: rec['Status_Scrape'] for link, rec in done.items()})
+    df['Isi_Berita'] = df['Isi_Berita'].fillna("").astype(str)
+    df['Status_Scrape'] = df['Status_Scrape'].fillna("")
+    return df
 
 def main():
     print("=============================================")
     print("   📰 NEWS CONTENT DOWNLOADER (NEWSPAPER3K)  ")
     print("=============================================")
 
-    # 1. Cek apakah kita melanjutkan pekerjaan (Resume) atau mulai baru
-    if os.path.exists(OUTPUT_FILE):
-        print(f"📂 File '{OUTPUT_FILE}' ditemukan. Melanjutkan scraping konten...")
-        df = pd.read_csv(OUTPUT_FILE)
-    else:
-        if os.path.exists(INPUT_FILE):
-            print(f"📂 Membaca file sumber: '{INPUT_FILE}'...")
-            df = pd.read_csv(INPUT_FILE)
-            # Bikin kolom baru kosong
-            df['Isi_Berita'] = ""
-            df['Status_Scrape'] = "" 
-        else:
-            print(f"❌ File input '{INPUT_FILE}' tidak ditemukan!")
-            return
-
-    # 2. Filter mana yang belum di-download (Isi_Berita masih kosong/NaN)
-    #    Kita anggap yang belum selesai adalah yang 'Isi_Berita' nya kosong atau NaN
+    # 1. Resume dari journal (kalau ada) atau mulai baru dari file link
+    journal = JsonlJournal(JOURNAL_FILE, fsync_every=JOURNAL_FSYNC_EVERY)
+    df = load_links_with_journal(journal)
+    if df is None:
+        return
+
+    # 2. Filter mana yang belum di-download (Isi_Berita masih kosong)
     total_data = len(df)
     
-    # Pastikan kolom Isi_Berita formatnya string dulu biar gak error
-    df['Isi_Berita'] = df['Isi_Berita'].fillna("").astype(str)
-    
     # Cari index mana saja yang masih kosong isinya
     indices_to_scrape = df[df['Isi_Berita'] == ""].index.tolist()
     
     print(f"📊 Total Link: {total_data}")
     print(f"⏳ Sisa Link yang perlu diambil kontennya: {len(indices_to_scrape)}")
-    print("🚀 Memulai proses download konten...\n")
+    print(f"🚀 Memulai proses download konten ({MAX_WORKERS} thread, maks {MAX_PER_DOMAIN} koneksi/host)...\n")
 
-    # 3. Loop dengan Progress Bar (tqdm)
-    counter = 0
+    # 3. Pipeline fetch -> parse dengan Progress Bar (tqdm)
+    tasks = [(index, df.at[index, 'Link']) for index in indices_to_scrape]
+    stats = PipelineStats()
+    pbar = tqdm(total=len(tasks), desc="Downloading")
     
-    for index in tqdm(indices_to_scrape, desc="Downloading"):
-        link = df.at[index, 'Link']
-        
-        # Ambil konten
-        content = download_article_content(link)
-        
-        # Simpan ke DataFrame di memori
-        df.at[index, 'Isi_Berita'] = content
-        df.at[index, 'Status_Scrape'] = "Sukses" if "ERROR" not in content else "Gagal"
-        
-        counter += 1
-        
-        # --- AUTO SAVE setiap 10 artikel ---
-        if counter % 10 == 0:
-            df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
-            # Jeda dikit biar server berita gak ngira kita serangan DDOS
-            time.sleep(random.uniform(0.5, 1.5))
-
-    # 4. Final Save
-    df.to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
+    try:
+        for index, content in download_concurrent(tasks, stats):
+            if content is None:
+                # Tidak ada di cache (mode offline): Isi_Berita tetap kosong supaya diambil di run online
+                pbar.update(1)
+                continue
+            status = "Sukses" if "ERROR" not in content else "Gagal"
+            # Simpan ke DataFrame di memori (hanya thread utama yang menulis ke df)
+            df.at[index, 'Isi_Berita'] = content
+            df.at[index, 'Status_Scrape'] = status
+            # Checkpoint: append 1 baris ke journal (tanpa menulis ulang seluruh CSV)
+            journal.append({'Link': df.at[index, 'Link'], 'Isi_Berita': content, 'Status_Scrape': status})
+            pbar.update(1)
+            pbar.set_postfix(stats.summary(), refresh=False)
+    except KeyboardInterrupt:
+        print("\n🛑 Stop Manual. Menyimpan progres...")
+    finally:
+        pbar.close()
+        journal.close()
+    print(f"📊 Pipeline: {stats.summary()}")
+
+    # 4. Compaction: tulis dataset final (Parquet + ekspor CSV) sekali di akhir
+    write_dataset(df, OUTPUT_FILE, export_csv=EXPORT_CSV)
     print(f"\n✅ SELESAI! Data lengkap tersimpan di: {OUTPUT_FILE}")
     
     # Statistik Singkat
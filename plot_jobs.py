@@ -0,0 +1,113 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Render grafik laporan secara paralel & malas (lazy).
+# Tiap script hanya menyiapkan daftar PlotJob (data kecil + fungsi render), lalu render_plots()
+# menggambar semuanya di process pool dengan backend Agg.
+# Hash data input + kode fungsi render disimpan per folder output; gambar yang input-nya
+# tidak berubah sejak run sebelumnya tidak digambar ulang.
+
+PLOT_HASH_FILE = ".plot_hashes.json"
+
+class PlotJob:
+    """
+    1 file gambar: render(data) menggambar ke figure aktif pyplot, penyimpanan diurus render_plots.
+    render harus fungsi level modul (bisa di-pickle ke worker).
+    """
+    def __init__(self, path, render, data, dpi=300):
+        self.path = path
+        self.render = render
+        self.data = data
+        self.dpi = dpi
+
+    def digest(self):
+        try:
+            code = inspect.getsource(self.render)
+        except (OSError, TypeError):
+            code = self.render.__code__.co_code.hex()
+        payload = pickle.dumps((code, self.dpi, self.data), protocol=4)
+        return hashlib.sha256(payload).hexdigest()
+
+def _load_hashes(folder):
+    try:
+        with open(os.path.join(folder, PLOT_HASH_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_hashes(folder, hashes):
+    path = os.path.join(folder, PLOT_HASH_FILE)
+    with open(path + ".tmp", "w", encoding='utf-8') as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _init_plot_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+def _render_job(job):
+    import matplotlib.pyplot as plt
+    try:
+        job.render(job.data)
+        plt.savefig(job.path, dpi=job.dpi)
+    finally:
+        plt.close('all')
+    return job.path
+
+def render_plots(jobs, workers=1, force=False):
+    """
+    Gambar semua PlotJob yang input-nya berubah (atau file-nya belum ada).
+    force=True menggambar ulang semuanya. Return jumlah gambar yang dibuat.
+    Kalau ada grafik yang gagal, RuntimeError dilempar setelah grafik lain selesai disimpan.
+    """
+    hashes = {}
+    digests = {}
+    pending = []
+    for job in jobs:
+        folder, name = os.path.split(job.path)
+        folder = folder or "."
+        os.makedirs(folder, exist_ok=True)
+        folder_hashes = hashes.setdefault(folder, _load_hashes(folder))
+        digests[job.path] = job.digest()
+        if force or not os.path.exists(job.path) or folder_hashes.get(name) != digests[job.path]:
+            pending.append(job)
+    print(f"[-] Render grafik: {len(pending)} dibuat, {len(jobs) - len(pending)} tidak berubah (dilewati).")
+    if not pending:
+        return 0
+
+    done = 0
+    failed = []
+    def finish(job, error=None):
+        nonlocal done
+        if error is not None:
+            print(f"    [!] Gagal membuat grafik {job.path}: {error}")
+            failed.append(job.path)
+            return
+        folder, name = os.path.split(job.path)
+        hashes[folder or "."][name] = digests[job.path]
+        done += 1
+        print(f"    > Grafik disimpan: {job.path}")
+
+    if workers <= 1 or len(pending) == 1:
+        for job in pending:
+            try:
+                _render_job(job)
+            except Exception as e:
+                finish(job, e)
+            else:
+                finish(job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending)), initializer=_init_plot_worker) as executor:
+            futures = {executor.submit(_render_job, job): job for job in pending}
+            for future in as_completed(futures):
+                finish(futures[future], future.exception())
+
+    for folder, folder_hashes in hashes.items():
+        _save_hashes(folder, folder_hashes)
+    if failed:
+        raise RuntimeError(f"{len(failed)} grafik gagal dibuat: {', '.join(failed)}")
+    return done
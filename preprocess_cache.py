@@ -0,0 +1,59 @@
+import hashlib
+import sqlite3
+
+# Cache hasil preprocessing per dokumen di SQLite.
+# Key = hash teks mentah + fingerprint konfigurasi cleaner, jadi run berikutnya hanya
+# memproses artikel baru/berubah, dan perubahan noise words / regex otomatis membatalkan cache.
+
+def text_hash(text):
+    return hashlib.sha256(str(text).encode('utf-8')).hexdigest()
+
+class PreprocessCache:
+    """Tabel (text_hash, fingerprint) -> processed_text"""
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS processed (
+                text_hash      TEXT NOT NULL,
+                fingerprint    TEXT NOT NULL,
+                processed_text TEXT NOT NULL,
+                PRIMARY KEY (text_hash, fingerprint)
+            )
+        """)
+        self._conn.commit()
+
+    def prune_stale(self):
+        """Hapus hasil dari konfigurasi cleaner lama. Return jumlah baris yang dihapus."""
+        cur = self._conn.execute("DELETE FROM processed WHERE fingerprint != ?", (self.fingerprint,))
+        self._conn.commit()
+        return cur.rowcount
+
+    def get_many(self, hashes, batch_size=900):
+        """Return dict text_hash -> processed_text untuk hash yang sudah ada di cache"""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for i in range(0, len(unique), batch_size):
+            batch = unique[i:i + batch_size]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT text_hash, processed_text FROM processed "
+                f"WHERE fingerprint = ? AND text_hash IN ({placeholders})",
+                [self.fingerprint] + batch
+            )
+            found.update(rows)
+        return found
+
+    def put_many(self, items):
+        """items: iterable (text_hash, processed_text)"""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO processed (text_hash, fingerprint, processed_text) VALUES (?, ?, ?)",
+            ((h, self.fingerprint, text) for h, text in items)
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -1,9 +1,11 @@
 import pandas as pd
 import time
 import random
-import os
+import queue
+import threading
 import winsound
-from urllib.parse import unquote
+import lxml.html
+from urllib.parse import unquote, urljoin
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 from selenium import webdriver
@@ -11,13 +13,49 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from webdriver_manager.chrome import ChromeDriverManager
+from checkpoint_journal import JsonlJournal
+from dataset_io import dataset_exists, read_dataset, write_dataset
+from task_store import TaskStore, STATUS_DONE, STATUS_EMPTY
+from http_client import build_session, HtmlCache, fetch_html
+from url_dedup import canonicalize_url, ScalableBloomFilter
 
 # --- KONFIGURASI GLOBAL ---
 START_DATE_GLOBAL = "01/06/2025" # Format: MM/DD/YYYY
 END_DATE_GLOBAL   = "11/30/2025" # Format: MM/DD/YYYY
 OUTPUT_FILE       = "pestle_link.csv"
+JOURNAL_FILE      = "pestle_link.journal.jsonl" # Checkpoint append-only (sumber resume)
+TASK_DB_FILE      = "pestle_link_tasks.sqlite"  # Status task (keyword, periode, halaman)
+SEEN_FILTER_FILE  = "pestle_link_seen.bloom"    # Bloom filter URL kanonik yang sudah tersimpan (dedup lintas run)
+SEEN_FILTER_CAPACITY = 1_000_000  # Kapasitas slice pertama (slice baru dibuat otomatis kalau penuh)
+SEEN_FILTER_ERROR_RATE = 1e-4     # Peluang link baru keliru dianggap duplikat
+EXPORT_CSV = True  # Output utama Parquet (kalau pyarrow ada); False = tidak menulis ekspor CSV
 JUMLAH_HALAMAN_PER_BULAN = 10
 
+# Perencana window tanggal adaptif
+ADAPTIVE_WINDOWS = True   # False = selalu window bulanan tetap (cara lama)
+MIN_WINDOW_DAYS = 7       # Window yang mentok batas halaman dipecah 2 sampai minimal selebar ini
+SPARSE_THRESHOLD = 10     # Window dengan kartu hasil < ini dianggap "hampir kosong"
+MAX_MERGE_MONTHS = 3      # Keyword yang hampir kosong: gabungkan sampai sekian bulan per query
+
+# Worker pool browser
+BROWSER_WORKERS = 3       # Jumlah instance Chrome yang jalan paralel
+HEADLESS = True           # False = tampilkan jendela Chrome (CAPTCHA bisa diselesaikan manual)
+CAPTCHA_COOLDOWN = 120    # Detik jeda worker headless saat kena CAPTCHA sebelum muat ulang
+CAPTCHA_LOCK = threading.Lock()
+
+# Mode pengambilan halaman hasil pencarian:
+#   "http"     : HTTP client biasa + parsing lxml (ringan), fallback ke Selenium kalau kena CAPTCHA
+#   "selenium" : selalu render di Chrome (cara lama)
+#   "fixture"  : baca HTML yang pernah disimpan di SERP_FIXTURE_DIR saja (offline, untuk uji parser)
+FETCH_MODE = "http"
+SERP_FIXTURE_DIR = "serp_fixtures"
+SAVE_SERP_FIXTURES = False # True = simpan HTML hasil mode "http" supaya bisa diputar ulang di mode "fixture"
+FIXTURE_STATE_PREFIX = "fixture_" # Mode "fixture" memakai output/journal/task DB/bloom terpisah (tidak mencemari run asli)
+GOOGLE_BASE_URL = "https://www.google.com"
+
+SERP_SESSION = build_session(pool_maxsize=BROWSER_WORKERS)
+SERP_FIXTURES = HtmlCache(SERP_FIXTURE_DIR) if FETCH_MODE == "fixture" or SAVE_SERP_FIXTURES else None
+
 # Keyword PESTLE
 PESTLE_KEYWORDS = {
     'Political': [
@@ -48,8 +86,11 @@ PESTLE_KEYWORDS = {
     ]
 }
 
-def setup_driver():
+def setup_driver(headless=HEADLESS):
     options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--start-maximized")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
@@ -94,165 +135,530 @@ def generate_monthly_ranges(start_str, end_str):
         current = next_month
     return ranges
 
+def is_captcha_page(page_source):
+    page_source = page_source.lower()
+    return "unusual traffic" in page_source or "recaptcha" in page_source or "bukan robot" in page_source
+
+def is_no_results_page(page_source):
+    """Halaman hasil Google yang memang menyatakan tidak ada hasil (bukan halaman consent/JS/error)"""
+    page_source = page_source.lower()
+    return ("tidak cocok dengan dokumen apa pun" in page_source or "tidak ditemukan hasil" in page_source
+            or "did not match any" in page_source or "no results found" in page_source)
+
 def check_and_wait_captcha(driver):
     try:
-        page_source = driver.page_source.lower()
-        if "unusual traffic" in page_source or "recaptcha" in page_source or "bukan robot" in page_source:
-            print("\n🛑 🛑 CAPTCHA TERDETEKSI! SCRIPT DI-PAUSE 🛑 🛑")
-            alert_user_captcha()
-            input("👉 Jika sudah centang hijau / aman, TEKAN ENTER DI SINI untuk lanjut...")
-            print("✅ Melanjutkan scraping...")
+        if is_captcha_page(driver.page_source):
+            # Hanya 1 worker yang boleh menangani CAPTCHA dalam satu waktu
+            with CAPTCHA_LOCK:
+                if HEADLESS:
+                    # Browser tidak terlihat, jadi tidak bisa dicentang manual: tunggu lalu muat ulang
+                    print(f"\n🛑 CAPTCHA TERDETEKSI (headless)! Jeda {CAPTCHA_COOLDOWN} detik lalu muat ulang...")
+                    alert_user_captcha()
+                    time.sleep(CAPTCHA_COOLDOWN)
+                    driver.refresh()
+                else:
+                    print("\n🛑 🛑 CAPTCHA TERDETEKSI! SCRIPT DI-PAUSE 🛑 🛑")
+                    alert_user_captcha()
+                    input("👉 Jika sudah centang hijau / aman, TEKAN ENTER DI SINI untuk lanjut...")
+                    print("✅ Melanjutkan scraping...")
             return True
     except:
         pass
     return False
 
+def state_file(path):
+    """Path file state run ini (output, journal, task DB, bloom); mode "fixture" diberi prefix sendiri"""
+    return FIXTURE_STATE_PREFIX + path if FETCH_MODE == "fixture" else path
+
+def build_search_url(keyword, periode):
+    query = keyword.replace(' ', '+')
+    return (f"{GOOGLE_BASE_URL}/search?q={query}&tbm=nws&hl=id&gl=ID"
+            f"&tbs=cdr:1,cd_min:{periode['start']},cd_max:{periode['end']}")
+
+def _node_text(parent, selector):
+    nodes = parent.cssselect(selector)
+    if not nodes:
+        return None
+    return " ".join(nodes[0].text_content().split())
+
+def parse_serp_html(html):
+    """
+    Ekstrak kartu berita dari HTML hasil pencarian Google News (tanpa browser).
+    Return (cards, next_url). cards: list of dict {href, title, source, date}.
+    Kartu yang elemennya tidak lengkap di-skip (sama seperti versi Selenium).
+    """
+    try:
+        doc = lxml.html.fromstring(html)
+    except (lxml.etree.ParserError, ValueError):
+        return [], None # HTML kosong / rusak
+    cards = []
+    for card in doc.cssselect("div.SoaBEf"):
+        anchors = card.cssselect("a")
+        if not anchors or not anchors[0].get("href"):
+            continue
+        title = _node_text(card, "div.n0jPhd")
+        source = _node_text(card, "div.MgUUmf")
+        date_txt = _node_text(card, "div.OSrXXb")
+        if title is None or source is None or date_txt is None:
+            continue
+        cards.append({
+            'href': urljoin(GOOGLE_BASE_URL, anchors[0].get("href")),
+            'title': title,
+            'source': source,
+            'date': date_txt
+        })
+
+    next_btn = doc.cssselect("#pnnext")
+    next_url = None
+    if next_btn and next_btn[0].get("href"):
+        next_url = urljoin(GOOGLE_BASE_URL, next_btn[0].get("href"))
+    return cards, next_url
+
+class ScrapeState:
+    """State bersama antar worker browser: dedup link, journal, dan tabel status task"""
+    def __init__(self, journal, tasks, seen):
+        self.journal = journal
+        self.tasks = tasks
+        self.seen = seen # Bloom filter URL kanonik (data link lengkap cukup ada di journal)
+        self.link_count = 0
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_link(self, record):
+        """Simpan link baru (atomik). Return False kalau link sudah pernah tersimpan."""
+        with self._lock:
+            if not self.seen.add(canonicalize_url(record['Link'])):
+                return False
+            self.link_count += 1
+            # Checkpoint: append 1 baris ke journal begitu link baru ketemu
+            self.journal.append(record)
+            self.seen.synced = self.link_count
+            return True
+
+def seed_task_store_from_history(tasks, records):
+    """
+    Migrasi satu kali untuk hasil scraping lama yang belum punya tabel task:
+    pasangan Keyword|Periode yang ada di data dianggap selesai, kecuali
+    sejumlah BROWSER_WORKERS task terakhir (mungkin terhenti di tengah).
+    """
+    counts = {}
+    for r in records:
+        x = (r.get('Keyword'), r.get('Periode_Scrape'))
+        if None not in x:
+            counts[x] = counts.get(x, 0) + 1
+    ordered_tasks = list(counts) # dict menjaga urutan kemunculan pertama
+    unfinished = ordered_tasks[-BROWSER_WORKERS:]
+    for t in unfinished:
+        print(f"⚠️ Tugas terakhir dianggap belum tuntas: {t[0]} | {t[1]}")
+    for t in ordered_tasks[:len(ordered_tasks) - len(unfinished)]:
+        tasks.record(t[0], t[1], 0, STATUS_DONE, counts[t])
+
+def sync_seen_filter(seen, journal):
+    """
+    Lengkapi bloom filter dengan record journal yang belum masuk
+    (mis. run sebelumnya crash sebelum filter sempat disimpan). Return jumlah record journal.
+    Hanya ekor journal setelah `seen.synced_offset` yang dibaca, bukan seluruh journal.
+    """
+    size = journal.size()
+    if seen.synced_offset > size:
+        print(f"⚠️ Bloom filter '{state_file(SEEN_FILTER_FILE)}' tidak cocok dengan journal, dibangun ulang.")
+        seen.clear()
+    for record in journal.replay(seen.synced_offset):
+        seen.add(canonicalize_url(record['Link']))
+        seen.synced += 1
+    seen.synced_offset = size
+    return seen.synced
+
+def load_state(journal, tasks):
+    """Siapkan ScrapeState dari journal (link yang sudah ada untuk dedup)"""
+    seen = ScalableBloomFilter(state_file(SEEN_FILTER_FILE), SEEN_FILTER_CAPACITY, SEEN_FILTER_ERROR_RATE)
+    state = ScrapeState(journal, tasks, seen)
+    try:
+        # Migrasi satu kali: hasil lama yang masih berupa CSV dimasukkan ke journal
+        if not journal.exists() and dataset_exists(state_file(OUTPUT_FILE)):
+            print(f"📦 Migrasi '{state_file(OUTPUT_FILE)}' lama ke journal '{journal.path}'...")
+            for record in read_dataset(state_file(OUTPUT_FILE)).to_dict('records'):
+                journal.append(record)
+            journal.close()
+
+        state.link_count = sync_seen_filter(seen, journal)
+
+        if tasks.is_empty() and state.link_count:
+            print(f"📦 Membuat tabel task '{tasks.path}' dari riwayat data lama...")
+            seed_task_store_from_history(tasks, journal.replay())
+            
+        print(f"📂 Resume: {state.link_count} data link sudah ada. Status task: {tasks.summary()}")
+    except Exception as e:
+        print(f"⚠️ Warning Load File: {e}")
+    return state
+
+def save_cards(cards, task, state):
+    """Simpan kartu hasil parse_serp_html ke state. Return (jumlah baru, jumlah skip)."""
+    category, keyword, periode = task
+    saved = 0
+    skipped = 0
+    for card in cards:
+        record = {
+            "Kategori": category,
+            "Keyword": keyword,
+            "Periode_Scrape": periode['label'],
+            "Sumber": card['source'],
+            "Tanggal_Tayang": card['date'],
+            "Judul": card['title'],
+            "Link": clean_google_link(card['href'])
+        }
+        if state.add_link(record):
+            saved += 1
+        else:
+            skipped += 1
+    return saved, skipped
+
+def scrape_task_http(task, state, worker_name):
+    """
+    Versi ringan scrape_task: ambil HTML pakai HTTP client lalu parsing dengan lxml.
+    Return dict hasil (lihat scrape_task), atau None kalau kena CAPTCHA / halaman 1 tanpa kartu
+    dan tanpa penanda "tidak ada hasil" (mis. halaman consent/butuh JS) -> perlu fallback ke Selenium.
+    """
+    category, keyword, periode = task
+    print(f"🔎 [{worker_name}] Scrape (HTTP): [{category}] '{keyword}' | {periode['label']}")
+    url = build_search_url(keyword, periode)
+    result = {'saved': 0, 'seen': 0, 'saturated': False}
+
+    for page in range(1, JUMLAH_HALAMAN_PER_BULAN + 1):
+        if state.stop_event.is_set():
+            break
+        if FETCH_MODE == "fixture":
+            html = SERP_FIXTURES.get(url)
+            if html is None:
+                # Tidak ada fixture = dilewati, bukan hasil kosong
+                print(f"      -> [{worker_name}] Fixture tidak ada untuk halaman {page}, task dilewati.")
+                result['error'] = True
+                break
+        else:
+            try:
+                status, html = fetch_html(SERP_SESSION, url, timeout=20)
+            except Exception as e:
+                print(f"      -> [{worker_name}] Gagal request halaman {page}: {e}")
+                result['error'] = True
+                break
+            if status != 200 or is_captcha_page(html.decode('utf-8', errors='replace')):
+                return None
+            if not html.strip():
+                print(f"      -> [{worker_name}] Halaman {page} kosong.")
+                result['error'] = True
+                break
+            if SAVE_SERP_FIXTURES:
+                SERP_FIXTURES.put(url, html)
+
+        cards, next_url = parse_serp_html(html)
+        if not cards:
+            if page == 1 and not is_no_results_page(html.decode('utf-8', errors='replace')):
+                # Bukan hasil kosong yang pasti: jangan sampai window tercatat kosong
+                print(f"      -> [{worker_name}] Halaman 1 tanpa kartu & tanpa penanda 'tidak ada hasil'.")
+                return None
+            break
+        page_saved, page_skipped = save_cards(cards, task, state)
+        result['saved'] += page_saved
+        result['seen'] += len(cards)
+        state.tasks.record(keyword, periode['label'], page, STATUS_DONE if page_saved else STATUS_EMPTY, page_saved)
+        print(f"      -> [{worker_name}] Hal {page}: Ketemu {len(cards)} | Baru +{page_saved} | Skip {page_skipped}")
+
+        if not next_url:
+            break
+        if page == JUMLAH_HALAMAN_PER_BULAN:
+            # Masih ada halaman berikutnya padahal batas halaman habis: window jenuh
+            result['saturated'] = True
+            break
+        url = next_url
+        if FETCH_MODE == "http":
+            time.sleep(random.uniform(2, 4))
+    return result
+
+def scrape_task(driver, task, state, worker_name):
+    """
+    Scrape semua halaman hasil untuk 1 pasangan (keyword, periode).
+    Return dict: saved (link baru), seen (total kartu), saturated (mentok batas halaman),
+    error (True = gagal sementara, mis. halaman error / CAPTCHA tidak selesai; task tidak boleh dianggap selesai).
+    """
+    category, keyword, periode = task
+    print(f"🔎 [{worker_name}] Scrape: [{category}] '{keyword}' | {periode['label']}")
+    
+    url = build_search_url(keyword, periode)
+    
+    driver.get(url)
+    check_and_wait_captcha(driver)
+    
+    result = {'saved': 0, 'seen': 0, 'saturated': False}
+    
+    for page in range(1, JUMLAH_HALAMAN_PER_BULAN + 1):
+        if state.stop_event.is_set():
+            break
+        try:
+            # 1 snapshot DOM per halaman, lalu semua kartu di-parse lokal dengan lxml
+            # (bukan 4-5 round trip WebDriver per kartu)
+            cards, _ = parse_serp_html(driver.page_source)
+            
+            if not cards:
+                is_captcha = check_and_wait_captcha(driver)
+                if is_captcha:
+                    cards, _ = parse_serp_html(driver.page_source)
+                if not cards:
+                    if is_captcha_page(driver.page_source):
+                        # CAPTCHA masih ada setelah jeda (headless): bukan hasil kosong
+                        print(f"      -> [{worker_name}] CAPTCHA belum selesai di halaman {page}.")
+                        result['error'] = True
+                    break
+
+            page_found = len(cards)
+            page_saved, page_skipped = save_cards(cards, task, state)
+            result['saved'] += page_saved
+            result['seen'] += page_found
+            state.tasks.record(keyword, periode['label'], page, STATUS_DONE if page_saved else STATUS_EMPTY, page_saved)
+            
+            print(f"      -> [{worker_name}] Hal {page}: Ketemu {page_found} | Baru +{page_saved} | Skip {page_skipped}")
+
+            if page == JUMLAH_HALAMAN_PER_BULAN:
+                # Masih ada halaman berikutnya padahal batas halaman habis: window jenuh
+                result['saturated'] = bool(driver.find_elements(By.ID, "pnnext"))
+                break
+
+            next_btns = driver.find_elements(By.ID, "pnnext")
+            if not next_btns:
+                break # Halaman terakhir
+            next_btns[0].click()
+            time.sleep(random.uniform(2, 4))
+            check_and_wait_captcha(driver)
+        except Exception as e:
+            print(f"      -> [{worker_name}] Gagal memuat halaman {page}: {e}")
+            result['error'] = True
+            break
+    return result
+
+def make_window(start, end, label=None):
+    """Buat dict periode dari 2 datetime. Label default 'MM/DD/YYYY-MM/DD/YYYY'."""
+    start_str = start.strftime("%m/%d/%Y")
+    end_str = end.strftime("%m/%d/%Y")
+    return {'start': start_str, 'end': end_str, 'label': label or f"{start_str}-{end_str}"}
+
+def window_from_label(label):
+    """Kebalikan make_window untuk label rentang (dipakai saat resume task pecahan)"""
+    start_str, end_str = label.split("-")
+    return {'start': start_str, 'end': end_str, 'label': label}
+
+def split_window(periode):
+    """Pecah window jadi 2 bagian. Return [] kalau sudah terlalu sempit."""
+    start = datetime.strptime(periode['start'], "%m/%d/%Y")
+    end = datetime.strptime(periode['end'], "%m/%d/%Y")
+    days = (end - start).days + 1
+    if days < 2 * MIN_WINDOW_DAYS:
+        return []
+    mid = start + timedelta(days=days // 2 - 1)
+    return [make_window(start, mid), make_window(mid + timedelta(days=1), end)]
+
+class AdaptivePlanner:
+    """
+    Perencana task (keyword, window tanggal) yang menyesuaikan diri dengan hasil:
+    - Window yang mentok JUMLAH_HALAMAN_PER_BULAN dipecah 2 (sampai MIN_WINDOW_DAYS)
+      supaya bulan ramai tidak terpotong.
+    - Keyword yang window sebelumnya hampir kosong (< SPARSE_THRESHOLD kartu) digabung
+      dengan bulan-bulan berikutnya (maks MAX_MERGE_MONTHS) supaya hemat page load.
+    Tiap keyword berjalan sebagai rantai bulan: bulan berikutnya baru direncanakan setelah
+    bulan sebelumnya selesai, jadi urutan antrian tetap kira-kira "periode dulu".
+    """
+    def __init__(self, date_ranges, tasks):
+        self.months = date_ranges
+        self.tasks = tasks
+        self.queue = queue.Queue()
+        self.cursor = {}
+        self.sparse = {}
+        self.outstanding = 0
+        self._lock = threading.Lock()
+
+        self.category_of = {kw: cat for cat, kws in PESTLE_KEYWORDS.items() for kw in kws}
+        month_labels = {m['label'] for m in date_ranges}
+
+        # Resume: task pecahan yang sudah direncanakan tapi belum selesai
+        for keyword, label in tasks.pending_tasks():
+            if label in month_labels or " + " in label or keyword not in self.category_of:
+                continue
+            periode = window_from_label(label)
+            periode.update({'covers': [], 'split': True})
+            self._put((self.category_of[keyword], keyword, periode))
+
+        for category, keywords in PESTLE_KEYWORDS.items():
+            for keyword in keywords:
+                self.cursor[keyword] = 0
+                self._plan_next(category, keyword)
+
+    def _put(self, task):
+        self.outstanding += 1
+        self.queue.put(task)
+
+    def _plan_next(self, category, keyword):
+        """Masukkan window berikutnya (bulanan / gabungan) untuk 1 keyword ke antrian"""
+        i = self.cursor[keyword]
+        # Cek Resume (Apakah Keyword X di Bulan Y sudah selesai?)
+        while i < len(self.months) and self.tasks.is_done(keyword, self.months[i]['label']):
+            i += 1
+        if i >= len(self.months):
+            self.cursor[keyword] = i
+            return
+
+        covers = [self.months[i]]
+        if ADAPTIVE_WINDOWS and self.sparse.get(keyword):
+            while (len(covers) < MAX_MERGE_MONTHS and i + len(covers) < len(self.months)
+                   and not self.tasks.is_done(keyword, self.months[i + len(covers)]['label'])):
+                covers.append(self.months[i + len(covers)])
+        self.cursor[keyword] = i + len(covers)
+
+        if len(covers) == 1:
+            periode = dict(covers[0])
+        else:
+            # Label gabungan dibedakan dari label pecahan supaya tidak ikut di-restore sebagai pecahan
+            periode = {'start': covers[0]['start'], 'end': covers[-1]['end'],
+                       'label': " + ".join(m['label'] for m in covers)}
+        periode.update({'covers': [m['label'] for m in covers], 'split': False})
+        self._put((category, keyword, periode))
+
+    def next_task(self, stop_event):
+        """Ambil task berikutnya. None kalau semua task (termasuk pecahan/lanjutan) sudah habis."""
+        while not stop_event.is_set():
+            try:
+                return self.queue.get(timeout=0.5)
+            except queue.Empty:
+                with self._lock:
+                    if self.outstanding == 0:
+                        return None
+        return None
+
+    def finish(self, task, result):
+        category, keyword, periode = task
+        with self._lock:
+            self.tasks.finish_task(keyword, periode['label'], result['saved'])
+            # Window gabungan: tiap bulan yang tercakup ikut ditandai selesai
+            for label in periode['covers']:
+                if label != periode['label']:
+                    self.tasks.finish_task(keyword, label, 0)
+
+            if ADAPTIVE_WINDOWS and result['saturated']:
+                children = split_window(periode)
+                if children:
+                    print(f"✂️  '{keyword}' {periode['label']} jenuh, dipecah jadi {len(children)} window.")
+                for child in children:
+                    self.tasks.add_pending(keyword, child['label'])
+                    child.update({'covers': [], 'split': True})
+                    self._put((category, keyword, child))
+
+            if not periode['split']:
+                self.sparse[keyword] = result['seen'] < SPARSE_THRESHOLD
+                self._plan_next(category, keyword)
+            self.outstanding -= 1
+
+    def abandon(self, task):
+        """
+        Lepas task yang gagal tanpa menandainya selesai: status tetap 'running' sehingga diulang
+        saat resume. Rantai bulan keyword tsb tetap dilanjutkan supaya bulan lain tidak ikut tertahan.
+        """
+        category, keyword, periode = task
+        with self._lock:
+            if not periode['split']:
+                self._plan_next(category, keyword)
+            self.outstanding -= 1
+
+def browser_worker(worker_id, planner, state):
+    """
+    1 worker mengambil task (keyword, periode) dari antrian bersama.
+    Chrome baru dibuka saat dibutuhkan (mode "selenium", atau fallback CAPTCHA di mode "http").
+    """
+    worker_name = f"W{worker_id}"
+    driver = None
+    try:
+        while not state.stop_event.is_set():
+            task = planner.next_task(state.stop_event)
+            if task is None:
+                break
+            category, keyword, periode = task
+            finished = False
+            try:
+                state.tasks.start_task(keyword, periode['label'])
+                result = None
+                if FETCH_MODE in ("http", "fixture"):
+                    result = scrape_task_http(task, state, worker_name)
+                    if result is None:
+                        print(f"🛑 [{worker_name}] Halaman HTTP tidak bisa dipakai (CAPTCHA / bukan halaman hasil), fallback ke Selenium untuk task ini.")
+                if result is None and FETCH_MODE != "fixture":
+                    if driver is None:
+                        driver = setup_driver()
+                    result = scrape_task(driver, task, state, worker_name)
+                if state.stop_event.is_set():
+                    break # Task terpotong: tetap berstatus 'running' supaya diulang saat resume
+                if result is None or result.get('error'):
+                    # Gagal sementara: jangan dicatat selesai/kosong, biarkan 'running' untuk resume
+                    print(f"⚠️ [{worker_name}] Task '{keyword}' {periode['label']} belum tuntas, diulang saat resume.")
+                    continue
+                # Tandai task selesai setelah semua halaman keyword tsb beres (termasuk yang hasilnya 0),
+                # lalu rencanakan window lanjutan / pecahan
+                planner.finish(task, result)
+                finished = True
+            except Exception as e:
+                print(f"⚠️ [{worker_name}] Task '{keyword}' {periode['label']} gagal, diulang saat resume: {e}")
+                if driver is not None:
+                    # Browser bisa saja sudah rusak: buka yang baru untuk task berikutnya
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+            finally:
+                if not finished:
+                    planner.abandon(task)
+            time.sleep(random.uniform(1.5, 3))
+    finally:
+        if driver is not None:
+            driver.quit()
+
 def main():
     print("=============================================")
     print("   🤖 GOOGLE NEWS SCRAPER (PERIOD PRIORITY)   ")
     print("   Logika: Selesaikan 1 Bulan utk Semua KW   ")
     print("=============================================")
     
-    driver = setup_driver()
-    collected_data = []
-    unique_links = set()
-    completed_tasks = set()
-
-    # --- LOAD DATA LAMA ---
-    if os.path.exists(OUTPUT_FILE):
-        try:
-            existing = pd.read_csv(OUTPUT_FILE)
-            unique_links = set(existing['Link'].tolist())
-            collected_data = existing.to_dict('records')
-            
-            # Logic Resume: Mencatat pasangan Keyword|Periode yang sudah ada
-            if 'Keyword' in existing.columns and 'Periode_Scrape' in existing.columns:
-                task_history = list(zip(existing['Keyword'], existing['Periode_Scrape']))
-                seen = set()
-                ordered_tasks = []
-                for x in task_history:
-                    if x not in seen:
-                        ordered_tasks.append(x)
-                        seen.add(x)
-                
-                if ordered_tasks:
-                    last_task = ordered_tasks[-1]
-                    print(f"⚠️ Tugas terakhir dianggap belum tuntas: {last_task[0]} | {last_task[1]}")
-                    # Masukkan semua KECUALI yang terakhir ke daftar selesai
-                    for t in ordered_tasks[:-1]: 
-                        completed_tasks.add(f"{t[0]}|{t[1]}")
-                
-            print(f"📂 Resume: {len(collected_data)} data link sudah ada.")
-        except Exception as e:
-            print(f"⚠️ Warning Load File: {e}")
+    # --- LOAD DATA LAMA (REPLAY JOURNAL) ---
+    journal = JsonlJournal(state_file(JOURNAL_FILE))
+    tasks = TaskStore(state_file(TASK_DB_FILE))
+    state = load_state(journal, tasks)
 
     date_ranges = generate_monthly_ranges(START_DATE_GLOBAL, END_DATE_GLOBAL)
     print(f"📅 Target Waktu: {len(date_ranges)} Periode Bulanan.")
 
-    try:
-        # --- PERUBAHAN LOGIKA LOOPING DI SINI ---
-        # Loop 1: Periode (Bulan) dulu
-        for periode in date_ranges:
-            print(f"\n📆 MASUK PERIODE: {periode['label']} ({periode['start']} - {periode['end']})")
-            print("------------------------------------------------------")
-
-            # Loop 2: Kategori PESTLE
-            for category, keywords in PESTLE_KEYWORDS.items():
-                
-                # Loop 3: Keyword
-                for keyword in keywords:
-                    current_task_id = f"{keyword}|{periode['label']}"
-                    
-                    # Cek Resume (Apakah Keyword X di Bulan Y sudah selesai?)
-                    if current_task_id in completed_tasks:
-                        # Kita print short log saja biar tidak spamming
-                        # print(f"   ⏩ SKIP: {keyword} (Sudah ada)")
-                        continue 
-
-                    print(f"🔎 Scrape: [{category}] '{keyword}'")
-                    
-                    query = keyword.replace(' ', '+')
-                    url = (f"https://www.google.com/search?q={query}&tbm=nws&hl=id&gl=ID"
-                           f"&tbs=cdr:1,cd_min:{periode['start']},cd_max:{periode['end']}")
-                    
-                    driver.get(url)
-                    check_and_wait_captcha(driver)
-                    
-                    found_in_month = 0
-                    
-                    for page in range(1, JUMLAH_HALAMAN_PER_BULAN + 1):
-                        try:
-                            cards = driver.find_elements(By.CSS_SELECTOR, "div.SoaBEf")
-                            
-                            if not cards:
-                                is_captcha = check_and_wait_captcha(driver)
-                                if is_captcha:
-                                    cards = driver.find_elements(By.CSS_SELECTOR, "div.SoaBEf")
-                                if not cards:
-                                    break
-
-                            page_found = len(cards)
-                            page_saved = 0
-                            page_skipped = 0
-                            
-                            for card in cards:
-                                try:
-                                    link_elem = card.find_element(By.TAG_NAME, "a")
-                                    real_link = clean_google_link(link_elem.get_attribute("href"))
-                                    
-                                    # Cek Duplikat
-                                    if real_link in unique_links: 
-                                        page_skipped += 1
-                                        continue
-                                    
-                                    title = card.find_element(By.CSS_SELECTOR, "div.n0jPhd").text
-                                    source = card.find_element(By.CSS_SELECTOR, "div.MgUUmf").text
-                                    date_txt = card.find_element(By.CSS_SELECTOR, "div.OSrXXb").text
-                                    
-                                    unique_links.add(real_link)
-                                    collected_data.append({
-                                        "Kategori": category,
-                                        "Keyword": keyword,
-                                        "Periode_Scrape": periode['label'],
-                                        "Sumber": source,
-                                        "Tanggal_Tayang": date_txt,
-                                        "Judul": title,
-                                        "Link": real_link
-                                    })
-                                    page_saved += 1
-                                    found_in_month += 1
-                                except: 
-                                    continue
-                            
-                            print(f"      -> Hal {page}: Ketemu {page_found} | Baru +{page_saved} | Skip {page_skipped}")
-
-                            # Save otomatis tiap halaman dapat data
-                            if page_saved > 0:
-                                pd.DataFrame(collected_data).to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
-
-                            try:
-                                next_btn = driver.find_element(By.ID, "pnnext")
-                                next_btn.click()
-                                time.sleep(random.uniform(2, 4))
-                                check_and_wait_captcha(driver)
-                            except:
-                                break 
-                        except:
-                            break
-                    
-                    # Tandai task selesai setelah semua halaman keyword tsb beres
-                    completed_tasks.add(current_task_id)
-                    time.sleep(random.uniform(1.5, 3))
-                
-                # Jeda antar kategori dalam bulan yang sama (opsional)
-                # time.sleep(1)
+    # Antrian awal = bulan pertama yang belum selesai untuk tiap keyword;
+    # bulan berikutnya & pecahan window direncanakan oleh planner selama berjalan
+    planner = AdaptivePlanner(date_ranges, tasks)
+    print(f"🧵 {planner.queue.qsize()} task awal dibagi ke {BROWSER_WORKERS} worker "
+          f"(mode={FETCH_MODE}, headless={HEADLESS}, adaptif={ADAPTIVE_WINDOWS}).")
 
+    workers = [threading.Thread(target=browser_worker, args=(i + 1, planner, state))
+               for i in range(BROWSER_WORKERS)]
+    try:
+        for w in workers:
+            w.start()
+        # join pakai timeout supaya Ctrl+C tetap bisa ditangkap thread utama
+        while any(w.is_alive() for w in workers):
+            for w in workers:
+                w.join(timeout=0.5)
     except KeyboardInterrupt:
-        print("\n🛑 Stop Manual.")
+        print("\n🛑 Stop Manual. Menunggu worker menutup browser...")
+        state.stop_event.set()
+        for w in workers:
+            w.join()
     finally:
-        driver.quit()
-        if collected_data:
-            pd.DataFrame(collected_data).to_csv(OUTPUT_FILE, index=False, encoding='utf-8-sig')
+        journal.close()
+        tasks.close()
+        state.seen.synced_offset = journal.size()
+        state.seen.save()
+        # Compaction: tulis dataset final (Parquet + ekspor CSV) sekali di akhir dari journal
+        if state.link_count:
+            write_dataset(pd.DataFrame(list(journal.replay())), state_file(OUTPUT_FILE), export_csv=EXPORT_CSV)
         print("🎉 Selesai Total.")
 
 if __name__ == "__main__":
@@ -1,30 +1,110 @@
-import pandas as pd
 import re
-import nltk
 import string
 import os
+import json
+import hashlib
+import time
 import matplotlib.pyplot as plt
 import seaborn as sns
-from collections import Counter
-from nltk.tokenize import word_tokenize
+from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
-import swifter  # Untuk mempercepat pandas apply
-from datetime import datetime, timedelta  # [BARU] Untuk hitung tanggal relatif
-
-# Download resource NLTK jika belum ada
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+from datetime import datetime  # Tanggal patokan scraping (untuk tanggal relatif)
+from minhash_dedup import drop_near_duplicates
+from tanggal_utils import parse_dates
+from preprocess_cache import PreprocessCache, text_hash
+from corpus_stats import corpus_stats
+from dataset_io import dataset_exists, read_dataset, write_dataset
+from plot_jobs import PlotJob, render_plots
 
 # --- KONFIGURASI ---
 INPUT_FILE = "pestle_konten.csv"
 OUTPUT_FILE = "preprocessing_berita_revisi.csv" 
 VISUALIZATION_DIR = "preprocessing_berita_visualisasi_revisi"
+EXPORT_CSV = True  # Output utama Parquet (kalau pyarrow ada); False = tidak menulis ekspor CSV
+
+# Tokenizer untuk process_row:
+# "regex" = split whitespace (default, cepat, token sama dengan NLTK untuk teks yang sudah di-clean)
+# "nltk"  = nltk.word_tokenize (NLTK + resource punkt baru di-load kalau opsi ini dipilih)
+TOKENIZER = "regex"
+
+# Preprocessing paralel (pengganti swifter)
+PREPROCESS_WORKERS = max(1, (os.cpu_count() or 2) - 1)  # 1 = tanpa process pool
+PREPROCESS_CHUNK_SIZE = 500  # Dokumen per chunk yang dikirim ke 1 worker
+
+# Cache preprocessing inkremental: hanya artikel baru/berubah yang di-clean ulang
+USE_PREPROCESS_CACHE = True
+PREPROCESS_CACHE_FILE = "preprocessing_cache.sqlite"
+CLEANER_VERSION = 1  # Naikkan kalau logika process_row diubah (membatalkan cache lama)
+
+# Statistik korpus (eksak, tanpa sampling) memakai PREPROCESS_WORKERS yang sama
+STATS_CHUNK_SIZE = 2000  # Dokumen per chunk statistik
+STATS_TOP_K = 50         # Jumlah kata teratas yang disimpan
+
+# Render grafik paralel; grafik yang datanya tidak berubah sejak run sebelumnya dilewati
+PLOT_WORKERS = PREPROCESS_WORKERS
+FORCE_REPLOT = False
+
+# --- [UPDATE PENTING] SET TANGGAL SCRAPING ---
+# Jika scraping dilakukan 30 Nov 2025, set ini agar "Kemarin" terbaca sbg 29 Nov 2025
+# Jangan gunakan datetime.now() jika waktu preprocessing berbeda dengan waktu scraping
+SCRAPE_DATE = datetime(2025, 11, 30) # <-- Ubah tanggal ini sesuai waktu scraping Anda
+
+# Deduplikasi hampir-sama (MinHash + LSH)
+NEAR_DUP_ENABLED = True
+NEAR_DUP_THRESHOLD = 0.8   # Estimasi Jaccard shingle minimal agar 2 berita dianggap duplikat
+NEAR_DUP_NUM_PERM = 128    # Panjang signature MinHash
+NEAR_DUP_BANDS = 16        # Jumlah band LSH (rows per band = NUM_PERM / BANDS)
+NEAR_DUP_SHINGLE = 5       # Ukuran shingle (n-gram kata)
+
+# --- POLA CLEANING (dikompilasi sekali saat import) ---
+# URL, tag HTML, dan email tetap dihapus berurutan (urutan berpengaruh ke hasil);
+# angka, tanda baca, dan karakter non-ASCII digabung jadi 1 langkah encode + str.translate.
+RE_URL = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+RE_HTML_TAG = re.compile(r'<.*?>')
+RE_EMAIL = re.compile(r'(?<!\S)\S+@\S+')  # = \S+@\S+ (match selalu mulai di awal token), tanpa coba tiap posisi
+RE_ELONGATION = re.compile(r'(.)\1\1+')    # = (.)\1{2,}, bentuk ini lebih cepat di engine re
+CLEAN_TABLE = str.maketrans(string.punctuation, ' ' * len(string.punctuation), string.digits)
+
+# Kontraksi yang tetap dipecah word_tokenize NLTK walau teks sudah tanpa tanda baca
+NLTK_CONTRACTIONS = {
+    'cannot': ['can', 'not'], 'gimme': ['gim', 'me'], 'gonna': ['gon', 'na'],
+    'gotta': ['got', 'ta'], 'lemme': ['lem', 'me'], 'wanna': ['wan', 'na'],
+}
+
+def regex_tokenize(text):
+    """Tokenizer cepat untuk teks hasil clean_text_basic (huruf kecil ASCII, tanpa tanda baca)"""
+    tokens = text.split()
+    if NLTK_CONTRACTIONS.keys().isdisjoint(tokens):
+        return tokens
+    result = []
+    for t in tokens:
+        if t in NLTK_CONTRACTIONS:
+            result.extend(NLTK_CONTRACTIONS[t])
+        else:
+            result.append(t)
+    return result
+
+def load_nltk_tokenizer():
+    """Import NLTK (dan download punkt kalau belum ada) hanya saat TOKENIZER = 'nltk'"""
+    import nltk
+    from nltk.tokenize import word_tokenize
+    # Download resource NLTK jika belum ada
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt')
+    return word_tokenize
 
 class NewsPreprocessor:
-    def __init__(self):
-        print("[-] Menginisialisasi Cleaner (Mode: Light untuk BERTopic)...")
+    def __init__(self, tokenizer=TOKENIZER, verbose=True):
+        if verbose:
+            print(f"[-] Menginisialisasi Cleaner (Mode: Light untuk BERTopic, tokenizer: {tokenizer})...")
+        if tokenizer == "nltk":
+            self.tokenize = load_nltk_tokenizer()
+        elif tokenizer == "regex":
+            self.tokenize = regex_tokenize
+        else:
+            raise ValueError(f"TOKENIZER tidak dikenal: {tokenizer} (pilih 'regex' atau 'nltk')")
         
         # --- DAFTAR NOISE WORDS (STOPWORDS) ---
         # Sesuai permintaan: TIDAK DITAMBAH & TIDAK DIKURANG DARI VERSI AWAL
@@ -40,102 +120,122 @@ class NewsPreprocessor:
         }
 
     def clean_text_basic(self, text):
-        text = str(text)
-        text = text.lower()
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'<.*?>', '', text)
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'\d+', '', text)
-        text = re.sub(r'[%s]' % re.escape(string.punctuation), ' ', text)
-        text = re.sub(r'[^\x00-\x7f]', r'', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        text = str(text).lower()
+        # Regex hanya dijalankan kalau karakter kuncinya memang ada di teks
+        if 'http' in text or 'www' in text:
+            text = RE_URL.sub('', text)
+        if '<' in text:
+            text = RE_HTML_TAG.sub('', text)
+        if '@' in text:
+            text = RE_EMAIL.sub('', text)
+        # Non-ASCII (termasuk angka unicode) dibuang, lalu angka dihapus & tanda baca jadi spasi
+        text = text.encode('ascii', 'ignore').decode('ascii').translate(CLEAN_TABLE)
+        return ' '.join(text.split())
 
     def normalize_elongation(self, text):
-        return re.sub(r'(.)\1{2,}', r'\1', text)
+        return RE_ELONGATION.sub(r'\1', text)
 
     def process_row(self, text):
         text = self.clean_text_basic(text)
         text = self.normalize_elongation(text)
         if len(text) == 0: return ""
-        tokens = word_tokenize(text)
+        tokens = self.tokenize(text)
         # Filter tokens berdasarkan noise_words
         clean_tokens = [t for t in tokens if t not in self.noise_words]
         return " ".join(clean_tokens)
 
+    def fingerprint(self, tokenizer=TOKENIZER):
+        """Hash konfigurasi cleaner (noise words, pola regex, tokenizer) untuk key cache"""
+        config = {
+            'version': CLEANER_VERSION,
+            'noise_words': sorted(self.noise_words),
+            'patterns': [RE_URL.pattern, RE_HTML_TAG.pattern, RE_EMAIL.pattern, RE_ELONGATION.pattern],
+            'table': sorted(CLEAN_TABLE.items()),
+            'tokenizer': tokenizer,
+        }
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+# --- PREPROCESSING PARALEL ---
+_worker_processor = None
+
+def _init_preprocess_worker(tokenizer):
+    """Initializer worker: NewsPreprocessor dibuat sekali per proses, bukan di-pickle tiap task"""
+    global _worker_processor
+    _worker_processor = NewsPreprocessor(tokenizer=tokenizer, verbose=False)
+
+def _preprocess_chunk(texts):
+    return [_worker_processor.process_row(t) for t in texts]
+
+def preprocess_texts(texts, workers=PREPROCESS_WORKERS, chunk_size=PREPROCESS_CHUNK_SIZE, tokenizer=TOKENIZER):
+    """
+    Jalankan NewsPreprocessor.process_row untuk semua teks.
+    Teks dibagi per chunk ke ProcessPoolExecutor; hasil dikembalikan sesuai urutan input.
+    """
+    texts = list(texts)
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    print(f"[-] Processing NLP: {len(texts)} dokumen, {len(chunks)} chunk, {workers} worker...")
+    start = time.perf_counter()
+    results = []
+    with tqdm(total=len(texts), desc="Processing NLP") as pbar:
+        if workers <= 1:
+            _init_preprocess_worker(tokenizer)
+            for chunk in chunks:
+                results.extend(_preprocess_chunk(chunk))
+                pbar.update(len(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_preprocess_worker,
+                                     initargs=(tokenizer,)) as executor:
+                # executor.map menjaga urutan chunk, hasil dialirkan begitu chunk terdepan selesai
+                for chunk, processed in zip(chunks, executor.map(_preprocess_chunk, chunks)):
+                    results.extend(processed)
+                    pbar.update(len(chunk))
+    elapsed = time.perf_counter() - start
+    print(f"    > Throughput: {len(texts) / max(elapsed, 1e-9):.1f} dok/detik ({elapsed:.1f} detik)")
+    return results
+
+def preprocess_incremental(texts, cache_file=PREPROCESS_CACHE_FILE, tokenizer=TOKENIZER):
+    """
+    preprocess_texts dengan cache per dokumen (hash teks mentah + fingerprint cleaner).
+    Dokumen yang sudah pernah diproses dengan konfigurasi yang sama diambil dari cache.
+    """
+    texts = list(texts)
+    fingerprint = NewsPreprocessor(tokenizer=tokenizer, verbose=False).fingerprint(tokenizer)
+    cache = PreprocessCache(cache_file, fingerprint)
+    try:
+        stale = cache.prune_stale()
+        if stale:
+            print(f"[-] Cache preprocessing: {stale} hasil dari konfigurasi cleaner lama dihapus.")
+        hashes = [text_hash(t) for t in texts]
+        cached = cache.get_many(hashes)
+        missing = {}
+        for h, t in zip(hashes, texts):
+            if h not in cached:
+                missing.setdefault(h, t)
+        print(f"[-] Cache preprocessing: {len(texts) - sum(h not in cached for h in hashes)} dokumen dari cache, "
+              f"{len(missing)} dokumen baru/berubah diproses.")
+        if missing:
+            processed = preprocess_texts(list(missing.values()), tokenizer=tokenizer)
+            new_results = dict(zip(missing.keys(), processed))
+            cache.put_many(new_results.items())
+            cached.update(new_results)
+        return [cached[h] for h in hashes]
+    finally:
+        cache.close()
+
 # --- FUNGSI PARSING TANGGAL INDONESIA & RELATIF ---
-def parse_indonesian_date(date_series):
+def parse_indonesian_date(date_series, reference_date=SCRAPE_DATE):
     """
-    Mengubah string tanggal Indonesia ke datetime.
+    Mengubah string tanggal Indonesia ke datetime (vectorized, lihat tanggal_utils.parse_dates).
     Mendukung format:
     1. Absolut: "Senin, 20 Februari 2024"
-    2. Relatif: "2 hari lalu", "Kemarin", "Baru saja"
+    2. Relatif: "2 hari lalu", "Kemarin", "Baru saja" (dihitung dari reference_date)
     """
-    # Mapping bulan Indonesia ke Angka
-    month_map = {
-        'januari': '01', 'februari': '02', 'maret': '03', 'april': '04',
-        'mei': '05', 'juni': '06', 'juli': '07', 'agustus': '08',
-        'september': '09', 'oktober': '10', 'november': '11', 'desember': '12',
-        'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04', 'jun': '06',
-        'jul': '07', 'agu': '08', 'sep': '09', 'okt': '10', 'nov': '11', 'des': '12',
-        'agust': '08'
-    }
-    
-    # --- [UPDATE PENTING] SET TANGGAL SCRAPING ---
-    # Jika scraping dilakukan 30 Nov 2025, set ini agar "Kemarin" terbaca sbg 29 Nov 2025
-    # Jangan gunakan datetime.now() jika waktu preprocessing berbeda dengan waktu scraping
-    SCRAPE_DATE = datetime(2025, 11, 30) # <-- Ubah tanggal ini sesuai waktu scraping Anda
-    current_time = SCRAPE_DATE
-
-    def clean_date_str(x):
-        x_str = str(x).lower().strip()
-        
-        # --- [BARU] LOGIKA TANGGAL RELATIF ---
-        
-        # 1. "Baru saja", "x jam lalu" -> Anggap Hari Ini (Sesuai SCRAPE_DATE)
-        if any(k in x_str for k in ['baru saja', 'menit lalu', 'jam lalu', 'detik lalu', 'beberapa saat']):
-            return current_time.strftime("%d/%m/%Y")
-            
-        # 2. "Kemarin" -> SCRAPE_DATE - 1 Hari
-        if 'kemarin' in x_str:
-            return (current_time - timedelta(days=1)).strftime("%d/%m/%Y")
-            
-        # 3. "x hari lalu"
-        days_match = re.search(r'(\d+)\s+hari\s+lalu', x_str)
-        if days_match:
-            d = int(days_match.group(1))
-            return (current_time - timedelta(days=d)).strftime("%d/%m/%Y")
-            
-        # 4. "x minggu lalu"
-        weeks_match = re.search(r'(\d+)\s+minggu\s+lalu', x_str)
-        if weeks_match:
-            w = int(weeks_match.group(1))
-            return (current_time - timedelta(weeks=w)).strftime("%d/%m/%Y")
-            
-        # 5. "x bulan lalu" (Estimasi kasar 30 hari)
-        months_match = re.search(r'(\d+)\s+bulan\s+lalu', x_str)
-        if months_match:
-            m = int(months_match.group(1))
-            return (current_time - timedelta(days=m*30)).strftime("%d/%m/%Y")
-
-        # --- LOGIKA TANGGAL STANDAR ---
-        x_str = re.sub(r'(senin|selasa|rabu|kamis|jumat|sabtu|minggu)\s*,?', '', x_str).strip()
-        for ind, eng in month_map.items():
-            # Pakai spasi agar tidak mereplace bagian kata lain (misal: 'jan' di 'janjian')
-            x_str = x_str.replace(f" {ind} ", f"/{eng}/")
-            x_str = x_str.replace(f" {ind}", f"/{eng}/") 
-        
-        x_str = re.sub(r'\s*\d{2}:\d{2}.*', '', x_str) # Hapus jam
-        x_str = x_str.replace(" ", "") 
-        return x_str
-
-    cleaned_series = date_series.apply(clean_date_str)
-    return pd.to_datetime(cleaned_series, dayfirst=True, errors='coerce')
+    return parse_dates(date_series, reference_date)
 
 # --- FUNGSI VISUALISASI TREN (DEBUGGING MODE) ---
 def plot_trend_distribution(df, output_dir, title_prefix="Raw Data"):
-    """Visualisasi Tren Berita dengan Debugging Tanggal"""
-    print(f"[-] Membuat Grafik Tren untuk: {title_prefix}...")
+    """Visualisasi Tren Berita dengan Debugging Tanggal. Return daftar PlotJob (digambar lewat render_plots)."""
+    print(f"[-] Menyiapkan Grafik Tren untuk: {title_prefix}...")
     
     date_col = None
     possible_cols = ['Tanggal_Tayang', 'tanggal', 'date', 'waktu', 'Date', 'Time']
@@ -146,7 +246,7 @@ def plot_trend_distribution(df, output_dir, title_prefix="Raw Data"):
     
     if not date_col:
         print("[!] Kolom tanggal tidak ditemukan.")
-        return
+        return []
 
     # Parsing Tanggal (Sekarang support Relative Date)
     df['parsed_date'] = parse_indonesian_date(df[date_col])
@@ -164,67 +264,77 @@ def plot_trend_distribution(df, output_dir, title_prefix="Raw Data"):
 
     if len(valid_dates) == 0:
         print("[!] Tidak ada tanggal valid untuk di-plot.")
-        return
-
-    os.makedirs(output_dir, exist_ok=True)
-    sns.set_style("whitegrid")
+        return []
 
     # Hitung per bulan & Sort
     monthly_counts = valid_dates.groupby(valid_dates['parsed_date'].dt.to_period('M')).size()
+    if monthly_counts.empty:
+        return []
+    monthly_counts = monthly_counts.sort_index()
 
-    if not monthly_counts.empty:
-        monthly_counts = monthly_counts.sort_index()
-        
-        x_dates = monthly_counts.index.astype(str)
-        y_values = monthly_counts.values
+    filename = f"0_tren_berita_{title_prefix.lower().replace(' ', '_')}.png"
+    data = {
+        'x_dates': list(monthly_counts.index.astype(str)),
+        'y_values': [int(v) for v in monthly_counts.values],
+        'title_prefix': title_prefix
+    }
+    return [PlotJob(os.path.join(output_dir, filename), _render_trend, data)]
 
-        plt.figure(figsize=(12, 6))
-        # Menggunakan warna merah untuk Raw Data
-        color = '#e74c3c' if "Raw" in title_prefix else '#2980b9'
-        sns.lineplot(x=x_dates, y=y_values, marker='o', linewidth=2.5, color=color)
-        
-        for x, y in zip(x_dates, y_values):
-            plt.text(x, y + (max(y_values)*0.02), f'{y}', ha='center', va='bottom', fontweight='bold', fontsize=10)
-        
-        plt.title(f"Tren Volume Berita ({title_prefix})", fontsize=16, pad=15)
-        plt.xlabel("Bulan", fontsize=12)
-        plt.ylabel("Total Berita", fontsize=12)
-        plt.xticks(rotation=45)
-        plt.grid(True, which='both', linestyle='--', linewidth=0.5)
-        plt.tight_layout()
-        
-        filename = f"0_tren_berita_{title_prefix.lower().replace(' ', '_')}.png"
-        plt.savefig(os.path.join(output_dir, filename), dpi=300)
-        plt.close()
-        print(f"[-] Grafik disimpan: {filename}")
+def _render_trend(data):
+    x_dates, y_values, title_prefix = data['x_dates'], data['y_values'], data['title_prefix']
+    sns.set_style("whitegrid")
+    plt.figure(figsize=(12, 6))
+    # Menggunakan warna merah untuk Raw Data
+    color = '#e74c3c' if "Raw" in title_prefix else '#2980b9'
+    sns.lineplot(x=x_dates, y=y_values, marker='o', linewidth=2.5, color=color)
+
+    for x, y in zip(x_dates, y_values):
+        plt.text(x, y + (max(y_values)*0.02), f'{y}', ha='center', va='bottom', fontweight='bold', fontsize=10)
+
+    plt.title(f"Tren Volume Berita ({title_prefix})", fontsize=16, pad=15)
+    plt.xlabel("Bulan", fontsize=12)
+    plt.ylabel("Total Berita", fontsize=12)
+    plt.xticks(rotation=45)
+    plt.grid(True, which='both', linestyle='--', linewidth=0.5)
+    plt.tight_layout()
 
 # --- FUNGSI ANALISIS STATISTIK ---
-def analyze_corpus_stats(text_series, label="Data"):
+def analyze_corpus_stats(text_series, label="Data", workers=PREPROCESS_WORKERS):
+    """Statistik korpus dalam 1 kali jalan (lihat corpus_stats.corpus_stats)"""
     print(f"[-] Menghitung statistik untuk: {label}...")
-    doc_lengths = text_series.apply(lambda x: len(str(x).split()))
-    sample_text = text_series if len(text_series) < 5000 else text_series.sample(5000)
-    all_words = []
-    for text in tqdm(sample_text, desc=f"Counting Words ({label})"):
-        all_words.extend(str(text).split())
-    word_counts = Counter(all_words)
+    stats = corpus_stats(text_series, workers=workers, chunk_size=STATS_CHUNK_SIZE,
+                         top_k=STATS_TOP_K, desc=f"Counting Words ({label})")
     return {
-        "Total Dokumen": len(text_series),
-        "Total Kata (Est)": sum(doc_lengths),
-        "Rata-rata Kata/Dokumen": doc_lengths.mean(),
-        "Vocabulary": len(word_counts),
-        "Doc Lengths": doc_lengths, 
-        "Word Counts": word_counts
+        "Total Dokumen": stats["n_docs"],
+        "Total Kata": stats["n_tokens"],
+        "Rata-rata Kata/Dokumen": stats["n_tokens"] / max(stats["n_docs"], 1),
+        "Vocabulary": stats["vocabulary"],
+        "Length Histogram": stats["length_hist"],
+        "Top Words": stats["top_words"]
     }
 
 def plot_comparison(stats_before, stats_after, data_flow_stats, output_dir):
-    print("[-] Membuat Visualisasi Perbandingan Lengkap...")
-    os.makedirs(output_dir, exist_ok=True)
+    """Siapkan grafik pipeline, distribusi panjang & top words. Return daftar PlotJob."""
+    print("[-] Menyiapkan Visualisasi Perbandingan Lengkap...")
+    jobs = [
+        PlotJob(os.path.join(output_dir, "1_pipeline_data_reduction.png"), _render_pipeline,
+                [data_flow_stats['raw'], stats_after['Total Dokumen']]),
+        PlotJob(os.path.join(output_dir, "2_distribusi_panjang_kata.png"), _render_length_hist,
+                [stats_before["Length Histogram"], stats_after["Length Histogram"]])
+    ]
+    top_n = 15
+    top_before = stats_before["Top Words"][:top_n]
+    top_after = stats_after["Top Words"][:top_n]
+    if top_before and top_after:
+        jobs.append(PlotJob(os.path.join(output_dir, "3_top_words_comparison.png"), _render_top_words,
+                            {'top_n': top_n, 'before': top_before, 'after': top_after}))
+    return jobs
+
+# --- RENDER GRAFIK (dipanggil di worker render_plots) ---
+def _render_pipeline(values):
     sns.set_style("whitegrid")
-    
-    # 1. PIPELINE
     plt.figure(figsize=(10, 6))
     stages = ['Raw Data', 'Final/Clean Data']
-    values = [data_flow_stats['raw'], stats_after['Total Dokumen']]
     colors = ['#95a5a6', '#2ecc71']
     ax = sns.barplot(x=stages, y=values, palette=colors)
     plt.title("Data Reduction Pipeline", fontsize=16, pad=20)
@@ -232,33 +342,28 @@ def plot_comparison(stats_before, stats_after, data_flow_stats, output_dir):
     for i, v in enumerate(values):
         ax.text(i, v + (max(values)*0.02), f"{v:,}", ha='center', fontweight='bold', fontsize=12)
     plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, "1_pipeline_data_reduction.png"), dpi=300)
-    plt.close()
 
-    # 2. HISTOGRAM
+def _render_length_hist(hists):
+    sns.set_style("whitegrid")
     plt.figure(figsize=(10, 6))
-    sns.histplot(stats_before["Doc Lengths"], color="skyblue", label="Sebelum NLP", kde=True, element="step", alpha=0.5)
-    sns.histplot(stats_after["Doc Lengths"], color="orange", label="Sesudah NLP", kde=True, element="step", alpha=0.5)
+    # Histogram dari Counter panjang dokumen -> jumlah dokumen (weights), bukan list panjang per dokumen
+    for hist, color, label in zip(hists, ("skyblue", "orange"), ("Sebelum NLP", "Sesudah NLP")):
+        sns.histplot(x=list(hist.keys()), weights=list(hist.values()), color=color, label=label,
+                     bins=50, kde=len(hist) > 1, element="step", alpha=0.5) # KDE butuh >1 nilai panjang unik
     plt.title("Perubahan Distribusi Panjang Artikel")
     plt.legend()
-    plt.savefig(os.path.join(output_dir, "2_distribusi_panjang_kata.png"), dpi=300)
-    plt.close()
-    
-    # 3. TOP WORDS
-    top_n = 15
-    top_before = stats_before["Word Counts"].most_common(top_n)
-    top_after = stats_after["Word Counts"].most_common(top_n)
-    if top_before and top_after:
-        fig, axes = plt.subplots(1, 2, figsize=(16, 8))
-        wb, cb = zip(*top_before)
-        sns.barplot(x=list(cb), y=list(wb), ax=axes[0], palette="Reds_d")
-        axes[0].set_title(f"Top {top_n} Kata SEBELUM Cleaning", fontsize=12)
-        wa, ca = zip(*top_after)
-        sns.barplot(x=list(ca), y=list(wa), ax=axes[1], palette="Greens_d")
-        axes[1].set_title(f"Top {top_n} Kata SESUDAH Cleaning", fontsize=12)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, "3_top_words_comparison.png"), dpi=300)
-        plt.close()
+
+def _render_top_words(tops):
+    sns.set_style("whitegrid")
+    top_n, top_before, top_after = tops['top_n'], tops['before'], tops['after']
+    fig, axes = plt.subplots(1, 2, figsize=(16, 8))
+    wb, cb = zip(*top_before)
+    sns.barplot(x=list(cb), y=list(wb), ax=axes[0], palette="Reds_d")
+    axes[0].set_title(f"Top {top_n} Kata SEBELUM Cleaning", fontsize=12)
+    wa, ca = zip(*top_after)
+    sns.barplot(x=list(ca), y=list(wa), ax=axes[1], palette="Greens_d")
+    axes[1].set_title(f"Top {top_n} Kata SESUDAH Cleaning", fontsize=12)
+    plt.tight_layout()
 
 def save_preprocessing_report(data_flow_stats, stats_before, stats_after, sample_comparisons, output_dir):
     report_file = os.path.join(output_dir, "RANGKUMAN_METODOLOGI_PREPROCESSING.txt")
@@ -272,7 +377,8 @@ def save_preprocessing_report(data_flow_stats, stats_before, stats_after, sample
         f.write("[1] ALUR PROSES (PIPELINE)\n")
         f.write("    Proses preprocessing dilakukan dengan tahapan berikut:\n")
         f.write("    1. Filtering Status  : Menghapus data yang gagal di-scrape ('Status_Scrape' != 'Sukses').\n")
-        f.write("    2. Deduplikasi       : Menghapus data ganda berdasarkan isi konten yang persis sama.\n")
+        f.write("    2. Deduplikasi       : Menghapus data ganda berdasarkan isi konten yang persis sama,\n")
+        f.write("                           lalu berita hampir-sama (MinHash + LSH, 1 wakil per cluster).\n")
         f.write("    3. Lowercasing       : Mengubah semua huruf menjadi kecil.\n")
         f.write("    4. Regex Cleaning    : Menghapus URL, Email, HTML Tags, dan Angka.\n")
         f.write("    5. Punctuation Removal: Menghapus tanda baca secara total (diganti spasi).\n")
@@ -293,7 +399,7 @@ def save_preprocessing_report(data_flow_stats, stats_before, stats_after, sample
         f.write(f"    {'METRIK':<25} | {'SEBELUM (RAW)':<15} | {'SESUDAH (CLEAN)':<15}\n")
         f.write("-" * 65 + "\n")
         f.write(f"    {'Total Dokumen':<25} | {stats_before['Total Dokumen']:<15} | {stats_after['Total Dokumen']:<15}\n")
-        f.write(f"    {'Total Kata (Est)':<25} | {stats_before['Total Kata (Est)']:<15} | {stats_after['Total Kata (Est)']:<15}\n")
+        f.write(f"    {'Total Kata':<25} | {stats_before['Total Kata']:<15} | {stats_after['Total Kata']:<15}\n")
         f.write(f"    {'Rata-rata Kata/Dok':<25} | {stats_before['Rata-rata Kata/Dokumen']:<15.2f} | {stats_after['Rata-rata Kata/Dokumen']:<15.2f}\n")
         f.write(f"    {'Ukuran Vocabulary':<25} | {stats_before['Vocabulary']:<15} | {stats_after['Vocabulary']:<15}\n\n")
 
@@ -322,17 +428,17 @@ def main():
     print(" 🧹 PREPROCESSING BERITA (FULL SCRIPT)    ")
     print("==========================================")
     
-    if not os.path.exists(INPUT_FILE):
+    if not dataset_exists(INPUT_FILE):
         print(f"[!] File {INPUT_FILE} tidak ditemukan.")
         return
     
     # 1. LOAD RAW DATA
-    print("[-] Membaca file CSV...")
-    df_raw = pd.read_csv(INPUT_FILE)
+    print("[-] Membaca dataset...")
+    df_raw = read_dataset(INPUT_FILE)
     count_raw = len(df_raw)
     
     # --- VISUALISASI RAW DATA SEBELUM FILTER ---
-    plot_trend_distribution(df_raw, VISUALIZATION_DIR, title_prefix="Raw Data Sebelum Filter")
+    plot_jobs = plot_trend_distribution(df_raw, VISUALIZATION_DIR, title_prefix="Raw Data Sebelum Filter")
 
     # 2. Filter Status Scrape
     df = df_raw.copy()
@@ -347,35 +453,48 @@ def main():
     # 4. Deduplikasi
     df.drop_duplicates(subset=[target_col], inplace=True)
     count_deduped = len(df)
+
+    # 4b. Deduplikasi hampir-sama (berita sindikasi yang diedit sedikit)
+    if NEAR_DUP_ENABLED:
+        print("[-] Mencari berita hampir-duplikat (MinHash + LSH)...")
+        df, n_dup_clusters = drop_near_duplicates(
+            df, target_col, threshold=NEAR_DUP_THRESHOLD, num_perm=NEAR_DUP_NUM_PERM,
+            bands=NEAR_DUP_BANDS, shingle_size=NEAR_DUP_SHINGLE
+        )
+        print(f"    > {n_dup_clusters} cluster duplikat, {count_deduped - len(df)} berita dibuang.")
+    count_near_deduped = len(df)
     
     data_flow_stats = {
         'raw': count_raw, 
         'scraped': count_scraped, 
-        'deduped': count_deduped
+        'deduped': count_deduped,
+        'near_deduped': count_near_deduped
     }
-    print(f"[-] Data Unik Valid: {count_deduped}")
+    print(f"[-] Data Unik Valid: {count_near_deduped}")
 
     # 5. Analisis Awal (Before)
     stats_before = analyze_corpus_stats(df[target_col], label="BEFORE")
 
     # 6. Cleaning NLP
-    processor = NewsPreprocessor()
-    tqdm.pandas(desc="Processing NLP")
-    df['processed_text'] = df[target_col].swifter.apply(processor.process_row)
+    if USE_PREPROCESS_CACHE:
+        df['processed_text'] = preprocess_incremental(df[target_col])
+    else:
+        df['processed_text'] = preprocess_texts(df[target_col])
     df = df[df['processed_text'].str.strip().astype(bool)]
     
     # 7. Analisis Akhir (After)
     stats_after = analyze_corpus_stats(df['processed_text'], label="AFTER")
     
     # 8. Visualisasi Pipeline & Words
-    plot_comparison(stats_before, stats_after, data_flow_stats, VISUALIZATION_DIR)
+    plot_jobs += plot_comparison(stats_before, stats_after, data_flow_stats, VISUALIZATION_DIR)
+    render_plots(plot_jobs, workers=PLOT_WORKERS, force=FORCE_REPLOT)
     
     # 9. Laporan
     sample_indices = df.sample(min(5, len(df))).index
     sample_comparisons = list(zip(df.loc[sample_indices, target_col], df.loc[sample_indices, 'processed_text']))
     save_preprocessing_report(data_flow_stats, stats_before, stats_after, sample_comparisons, VISUALIZATION_DIR)
     
-    df.to_csv(OUTPUT_FILE, index=False)
+    write_dataset(df, OUTPUT_FILE, export_csv=EXPORT_CSV)
     print(f"\n[+] Selesai. Output: {OUTPUT_FILE}")
     print(f"[+] Cek folder '{VISUALIZATION_DIR}' untuk grafik Raw Data & hasil laporan .txt.")
 
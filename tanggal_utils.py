@@ -0,0 +1,151 @@
+import re
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Normalisasi tanggal berita Indonesia untuk 1 kolom pandas sekaligus (vectorized).
+# Dipakai bersama oleh fix_tanggal.py (output string ISO) dan
+# revisipreprocessingberita.py (output datetime untuk grafik tren).
+# Tanggal patokan scraping selalu dikirim sebagai parameter (untuk "kemarin", "2 hari lalu", dst).
+
+BULAN = {
+    'januari': '01', 'februari': '02', 'maret': '03', 'april': '04',
+    'mei': '05', 'juni': '06', 'juli': '07', 'agustus': '08',
+    'september': '09', 'oktober': '10', 'november': '11', 'desember': '12',
+    'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04', 'jun': '06',
+    'jul': '07', 'agu': '08', 'agust': '08', 'sep': '09', 'okt': '10', 'nov': '11', 'des': '12'
+}
+# Nama terpanjang dicoba lebih dulu supaya 'agustus' tidak terbaca sebagai 'agu' + 'stus'
+_BULAN_ALT = "|".join(sorted(BULAN, key=len, reverse=True))
+
+# Pola untuk normalize_to_iso (format output YYYY-MM-DD)
+RE_ISO = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+RE_RELATIF = re.compile(r'(\d+)\s+(detik|menit|jam|hari|minggu|bulan|tahun)')
+RE_ZONA_JAM = re.compile(r'wib|wita|wit|pukul.*')
+RE_SETELAH_KOMA = re.compile(r'[,|\|].*')
+RE_TGL_INDO = re.compile(r'(\d{1,2})\s+([a-z]+)\s+(\d{4})')
+RE_TGL_SLASH = re.compile(r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})')
+PANDAS_MIN_DATE = datetime(1677, 9, 22) # Batas bawah datetime64[ns]
+SATUAN_HARI = {'detik': 0, 'menit': 0, 'jam': 0, 'hari': 1, 'minggu': 7, 'bulan': 30, 'tahun': 365}
+
+# Pola untuk parse_dates (output datetime)
+RE_HARI_INI = re.compile(r'baru saja|menit lalu|jam lalu|detik lalu|beberapa saat')
+RE_HARI_LALU = re.compile(r'(\d+)\s+hari\s+lalu')
+RE_MINGGU_LALU = re.compile(r'(\d+)\s+minggu\s+lalu')
+RE_BULAN_LALU = re.compile(r'(\d+)\s+bulan\s+lalu')
+RE_NAMA_HARI = re.compile(r'(senin|selasa|rabu|kamis|jumat|sabtu|minggu)\s*,?')
+RE_NAMA_BULAN = re.compile(r' (%s) ?' % _BULAN_ALT)
+RE_JAM = re.compile(r'\s*\d{2}:\d{2}.*')
+
+def _days_before(reference_date, days):
+    """Array hari (float, NaN = tidak berlaku) -> datetime64[D] = reference_date - days"""
+    ref = np.datetime64(pd.Timestamp(reference_date).date(), 'D')
+    return ref - np.nan_to_num(days).astype('int64').astype('timedelta64[D]')
+
+def _max_days(reference_date, earliest):
+    """Jumlah hari maksimum yang masih bisa dikurangkan dari reference_date"""
+    return (pd.Timestamp(reference_date).to_pydatetime() - earliest).days
+
+def _normalize_unique(series, reference_date):
+    """
+    Ubah kolom tanggal 'alay' jadi string ISO YYYY-MM-DD (versi vectorized perbaiki_tanggal):
+    ISO tetap, relatif ("2 hari lalu", "kemarin") dihitung dari reference_date,
+    "17 November 2025 10:00 WIB" dan "17/11/2025" dikonversi.
+    Kosong -> "", yang tidak dikenali dikembalikan apa adanya.
+    Tiap tahap hanya memproses baris yang belum berhasil di tahap sebelumnya.
+    """
+    index = series.index
+    series = series.reset_index(drop=True) # Index posisi unik untuk assignment per tahap
+    teks = series.astype(str).str.lower().str.strip()
+    result = series.astype(object).copy() # Default: nilai asli (format tidak dikenali)
+    kosong = series.isna() | (teks == "")
+    result[kosong] = ""
+
+    iso = ~kosong & teks.str.match(RE_ISO)
+    result[iso] = teks[iso]
+    t = teks[~kosong & ~iso]
+
+    # 1. Relatif (detik/menit/jam/hari/minggu/bulan/tahun)
+    rel = t.str.extract(RE_RELATIF).dropna()
+    if len(rel):
+        days = pd.to_numeric(rel[0], errors='coerce').to_numpy(dtype=float) * rel[1].map(SATUAN_HARI).to_numpy(dtype=float)
+        ok = days <= _max_days(reference_date, datetime(1, 1, 1)) # Di luar jangkauan -> nilai asli
+        result[rel.index[ok]] = np.datetime_as_string(_days_before(reference_date, days[ok]), unit='D')
+        t = t.drop(rel.index)
+
+    # 2. Kemarin
+    kemarin = t.str.contains('kemarin', regex=False)
+    result[kemarin[kemarin].index] = (pd.Timestamp(reference_date) - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    t = t[~kemarin]
+
+    # 3. Format Indo (17 November 2025) lalu DD/MM/YYYY
+    bersih = t.str.replace(RE_ZONA_JAM, '', regex=True).str.strip()
+    bersih = bersih.str.replace(RE_SETELAH_KOMA, '', regex=True).str.strip()
+    indo = bersih.str.extract(RE_TGL_INDO)
+    indo[1] = indo[1].map(BULAN)
+    indo = indo.dropna()
+    result[indo.index] = indo[2] + "-" + indo[1] + "-" + indo[0].str.zfill(2)
+    bersih = bersih.drop(indo.index)
+
+    slash = bersih.str.extract(RE_TGL_SLASH).dropna()
+    result[slash.index] = slash[2] + "-" + slash[1].str.zfill(2) + "-" + slash[0].str.zfill(2)
+    result.index = index
+    return result
+
+def _parse_unique(series, reference_date):
+    """
+    Ubah kolom tanggal Indonesia jadi datetime64 (versi vectorized parse_indonesian_date).
+    Mendukung "Senin, 20 Februari 2024", "2 hari lalu", "Kemarin", "Baru saja". Gagal -> NaT.
+    """
+    index = series.index
+    series = series.reset_index(drop=True)
+    teks = series.astype(str).str.lower().str.strip()
+
+    # --- TANGGAL RELATIF -> DD/MM/YYYY ---
+    days = pd.Series(np.nan, index=series.index)
+    days[teks.str.contains('kemarin', regex=False)] = 1.0
+    days[teks.str.contains(RE_HARI_INI)] = 0.0
+    kandidat = teks[days.isna() & teks.str.contains('lalu', regex=False)]
+    for pattern, factor in ((RE_HARI_LALU, 1), (RE_MINGGU_LALU, 7), (RE_BULAN_LALU, 30)):
+        n = pd.to_numeric(kandidat.str.extract(pattern)[0], errors='coerce').dropna()
+        days[n.index] = n * factor
+        kandidat = kandidat.drop(n.index)
+    days = days.dropna()
+    days = days[days <= _max_days(reference_date, PANDAS_MIN_DATE)] # Di luar jangkauan -> NaT
+
+    # --- TANGGAL STANDAR ---
+    standar = teks.drop(days.index)
+    standar = standar.str.replace(RE_NAMA_HARI, '', regex=True).str.strip()
+    standar = standar.str.replace(RE_NAMA_BULAN, lambda m: f"/{BULAN[m.group(1)]}/", regex=True)
+    standar = standar.str.replace(RE_JAM, '', regex=True).str.replace(" ", "", regex=False)
+
+    cleaned = teks.copy()
+    cleaned[standar.index] = standar
+    if len(days):
+        rel_dates = pd.to_datetime(_days_before(reference_date, days.to_numpy()))
+        cleaned[days.index] = rel_dates.strftime("%d/%m/%Y")
+    parsed = pd.to_datetime(cleaned, dayfirst=True, errors='coerce')
+    parsed.index = index
+    return parsed
+
+# Nilai Tanggal_Tayang sangat berulang ("19 Jan 2025", "2 hari lalu", ...): kolom di-factorize,
+# tiap string unik diproses sekali, lalu hasilnya dipetakan balik ke semua baris.
+# Waktu proses jadi sebanding dengan jumlah string unik, bukan jumlah baris.
+
+def normalize_to_iso(series, reference_date):
+    """Versi memoized _normalize_unique (lihat docstring-nya untuk format yang didukung)"""
+    codes, uniques = pd.factorize(series)
+    mapped = _normalize_unique(pd.Series(uniques, dtype=object), reference_date).to_numpy(dtype=object)
+    result = np.full(len(codes), "", dtype=object) # NaN -> ""
+    result[codes >= 0] = mapped.take(codes[codes >= 0])
+    return pd.Series(result, index=series.index)
+
+def parse_dates(series, reference_date):
+    """Versi memoized _parse_unique (lihat docstring-nya untuk format yang didukung)"""
+    # Factorize versi string-nya supaya urutan & nilai pertama sama persis dengan
+    # versi per baris: pd.to_datetime menebak format dari nilai pertama.
+    codes, uniques = pd.factorize(series.astype(str))
+    mapped = _parse_unique(pd.Series(uniques, dtype=object), reference_date).to_numpy()
+    result = np.full(len(codes), np.datetime64('NaT'), dtype=mapped.dtype)
+    result[codes >= 0] = mapped.take(codes[codes >= 0])
+    return pd.Series(result, index=series.index)
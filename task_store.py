@@ -0,0 +1,86 @@
+import sqlite3
+import threading
+import time
+
+# Penyimpanan status task scraping link (keyword, periode, halaman) di SQLite.
+# Baris dengan page = 0 adalah ringkasan task secara keseluruhan,
+# baris page >= 1 mencatat hasil tiap halaman.
+
+STATUS_PENDING = "pending" # Sudah direncanakan (mis. hasil pecahan window) tapi belum dikerjakan
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"     # Selesai dan menghasilkan link baru
+STATUS_EMPTY = "empty"   # Selesai tapi tidak ada link baru (tetap tidak perlu diulang)
+
+class TaskStore:
+    """Tabel status task yang aman dipakai bersama beberapa thread worker"""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                keyword      TEXT    NOT NULL,
+                periode      TEXT    NOT NULL,
+                page         INTEGER NOT NULL,
+                status       TEXT    NOT NULL,
+                result_count INTEGER NOT NULL DEFAULT 0,
+                updated_at   REAL    NOT NULL,
+                PRIMARY KEY (keyword, periode, page)
+            )
+        """)
+        self._conn.commit()
+
+    def record(self, keyword, periode, page, status, result_count=0):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tasks (keyword, periode, page, status, result_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(keyword, periode, page) DO UPDATE SET "
+                "status = excluded.status, result_count = excluded.result_count, updated_at = excluded.updated_at",
+                (keyword, periode, page, status, result_count, time.time())
+            )
+            self._conn.commit()
+
+    def start_task(self, keyword, periode):
+        self.record(keyword, periode, 0, STATUS_RUNNING)
+
+    def finish_task(self, keyword, periode, result_count):
+        self.record(keyword, periode, 0, STATUS_DONE if result_count > 0 else STATUS_EMPTY, result_count)
+
+    def add_pending(self, keyword, periode):
+        self.record(keyword, periode, 0, STATUS_PENDING)
+
+    def pending_tasks(self):
+        """Task yang sudah direncanakan tapi belum selesai: list of (keyword, periode)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT keyword, periode FROM tasks WHERE page = 0 AND status IN (?, ?) ORDER BY updated_at",
+                (STATUS_PENDING, STATUS_RUNNING)
+            ).fetchall()
+
+    def is_done(self, keyword, periode):
+        """Cek 1 task lewat primary key (tanpa membaca data link sama sekali)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status FROM tasks WHERE keyword = ? AND periode = ? AND page = 0",
+                (keyword, periode)
+            ).fetchone()
+        return row is not None and row[0] in (STATUS_DONE, STATUS_EMPTY)
+
+    def is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+
+    def summary(self):
+        """Jumlah task (page = 0) per status"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE page = 0 GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
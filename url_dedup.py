@@ -0,0 +1,154 @@
+import hashlib
+import math
+import os
+import struct
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Dedup link lintas run scraping:
+# - canonicalize_url(): 1 artikel = 1 key walau beda parameter tracking / versi AMP / mobile
+# - ScalableBloomFilter: himpunan key yang ringkas (bit array) dan disimpan di disk,
+#   memori tetap kecil walau arsip link tumbuh sampai jutaan baris
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'referrer', 'cmpid', 'ocid', 'amp', 'outputtype', '_ga', '_gl', 'spm',
+}
+TRACKING_PREFIXES = ('utm_', 'at_', 'pk_', 'hsa_')
+HOST_PREFIXES = ('www.', 'amp.', 'm.', 'mobile.')
+AMP_SEGMENTS = {'amp', 'amp.html'}
+
+def canonicalize_url(url):
+    """
+    Key dedup sebuah URL artikel (bukan untuk di-download):
+    skema & fragment dibuang, host lowercase tanpa www./amp./m., segmen path 'amp'
+    dan slash di akhir dibuang, parameter tracking dibuang, sisa query diurutkan.
+    """
+    url = str(url).strip()
+    if "://" not in url:
+        url = "http://" + url
+    parts = urlsplit(url)
+
+    host = (parts.hostname or "").lower().rstrip('.')
+    stripped = True
+    while stripped:
+        stripped = False
+        for prefix in HOST_PREFIXES:
+            if host.startswith(prefix) and host.count('.') > 1:
+                host = host[len(prefix):]
+                stripped = True
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    segments = [s for s in parts.path.split('/') if s and s.lower() not in AMP_SEGMENTS]
+    path = '/' + '/'.join(segments)
+    if path.endswith('.amp'):
+        path = path[:-len('.amp')]
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(('', host, path, urlencode(query), '')).lstrip('/')
+
+class BloomFilter:
+    """Bloom filter ukuran tetap (double hashing di atas blake2b)"""
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def __contains__(self, key):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+class ScalableBloomFilter:
+    """
+    Bloom filter yang bertambah slice baru setiap slice terakhir penuh
+    (kapasitas x growth, error rate x tightening), jadi total false positive tetap terbatas.
+    File di disk: header + bit array tiap slice. `synced` = jumlah record journal yang sudah masuk,
+    `synced_offset` = posisi byte journal sampai record tersebut (resume cukup membaca ekor journal).
+    """
+    MAGIC = b"SBF2"
+    LEGACY_MAGIC = b"SBF1" # Format lama tanpa offset journal: diabaikan, filter dibangun ulang
+
+    def __init__(self, path, initial_capacity=1_000_000, error_rate=1e-4, growth=2, tightening=0.5):
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.synced = 0
+        self.synced_offset = 0
+        self.slices = []
+        if os.path.exists(path):
+            self._load()
+
+    def _new_slice(self):
+        i = len(self.slices)
+        capacity = self.initial_capacity * (self.growth ** i)
+        error_rate = self.error_rate * (1 - self.tightening) * (self.tightening ** i)
+        self.slices.append(BloomFilter(capacity, error_rate))
+
+    def __contains__(self, key):
+        return any(key in s for s in self.slices)
+
+    def __len__(self):
+        return sum(s.count for s in self.slices)
+
+    def add(self, key):
+        """Tambah key. Return False kalau key (kemungkinan besar) sudah ada."""
+        if key in self:
+            return False
+        if not self.slices or self.slices[-1].count >= self.slices[-1].capacity:
+            self._new_slice()
+        self.slices[-1].add(key)
+        return True
+
+    def clear(self):
+        self.slices = []
+        self.synced = 0
+        self.synced_offset = 0
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack('<QQQ', self.synced, self.synced_offset, len(self.slices)))
+            for s in self.slices:
+                f.write(struct.pack('<QdQ', s.capacity, s.error_rate, s.count))
+                f.write(s.bits)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def _load(self):
+        with open(self.path, 'rb') as f:
+            magic = f.read(4)
+            if magic == self.LEGACY_MAGIC:
+                return
+            if magic != self.MAGIC:
+                raise ValueError(f"File '{self.path}' bukan file bloom filter")
+            self.synced, self.synced_offset, n_slices = struct.unpack('<QQQ', f.read(24))
+            for _ in range(n_slices):
+                capacity, error_rate, count = struct.unpack('<QdQ', f.read(24))
+                s = BloomFilter(capacity, error_rate)
+                f.readinto(s.bits)
+                s.count = count
+                self.slices.append(s)